@@ -0,0 +1,93 @@
+"""
+Shared pytest fixtures for the provider tests
+"""
+
+import sys
+
+# Short-lived test entry point - skip writing .pyc files for every import
+sys.dont_write_bytecode = True
+
+import asyncio
+import os
+
+import pytest
+import pytest_asyncio
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from providers import get_provider_class
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """One session-wide loop, on uvloop (as the service runs) when installed"""
+    try:
+        import uvloop
+        return uvloop.EventLoopPolicy()
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+
+
+PROVIDER_NAMES = ("verato", "internal", "hybrid")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Group each provider's tests so `-n 3 --dist loadgroup` keeps them on one worker"""
+    if not config.pluginmanager.hasplugin("xdist"):
+        return
+    for item in items:
+        callspec = getattr(item, "callspec", None)
+        if callspec and "provider_name" in callspec.params:
+            item.add_marker(pytest.mark.xdist_group(callspec.params["provider_name"]))
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def initialized_providers(request):
+    """Provider initialization, once per session
+
+    Yields a function mapping a provider name to a task resolving to
+    (provider, initialization error or None). Serial runs start every
+    provider concurrently up front; an xdist worker only initializes the
+    providers its tests ask for.
+    """
+    tasks = {}
+
+    async def initialize(name):
+        provider = get_provider_class(name)()
+        # Hybrid is left uninitialized to avoid its Verato/internal dependencies
+        if name != 'hybrid':
+            try:
+                await provider.initialize()
+            except Exception as e:
+                return provider, e
+        return provider, None
+
+    def get(name):
+        if name not in tasks:
+            tasks[name] = asyncio.create_task(initialize(name))
+        return tasks[name]
+
+    if not hasattr(request.config, "workerinput"):
+        for name in PROVIDER_NAMES:
+            get(name)
+
+    yield get
+
+    providers = [provider for provider, _ in await asyncio.gather(*tasks.values())]
+    await asyncio.gather(*(provider.cleanup() for provider in providers))
+
+
+@pytest.fixture(scope="module", params=PROVIDER_NAMES)
+def provider_name(request):
+    """Registry name of the provider under test"""
+    return request.param
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def provider(provider_name, initialized_providers):
+    """Shared provider instance for provider_name"""
+    provider, error = await initialized_providers(provider_name)
+    if error is not None:
+        pytest.skip(f"{provider_name} provider initialization failed (may be expected): {error}")
+    return provider
@@ -11,6 +11,7 @@ import asyncio
 
 import redis.asyncio as redis
 import orjson
+import msgpack
 from redis.exceptions import RedisError, ConnectionError
 
 from .config import get_redis_config, RedisConfig
@@ -112,30 +113,34 @@ class CacheManager:
             }
 
     # Serialization utilities
-    def serialize(self, data: Any) -> bytes:
-        """Serialize data using orjson for performance"""
+    def serialize(self, data: Any, packed: bool = False) -> bytes:
+        """Serialize data using orjson, or msgpack when packed=True"""
         try:
+            if packed:
+                return msgpack.packb(data, use_bin_type=True)
             return orjson.dumps(data)
         except Exception as e:
             logger.error(f"Serialization error: {e}")
             raise
 
-    def deserialize(self, data: bytes) -> Any:
-        """Deserialize data using orjson"""
+    def deserialize(self, data: bytes, packed: bool = False) -> Any:
+        """Deserialize data using orjson, or msgpack when packed=True"""
         try:
             if data is None:
                 return None
+            if packed:
+                return msgpack.unpackb(data, raw=False)
             return orjson.loads(data)
         except Exception as e:
             logger.error(f"Deserialization error: {e}")
             raise
 
     # Basic cache operations
-    async def get(self, key: str) -> Optional[Any]:
+    async def get(self, key: str, packed: bool = False) -> Optional[Any]:
         """Get value from cache with automatic deserialization"""
         try:
             raw_data = await self._client.get(key)
-            return self.deserialize(raw_data) if raw_data else None
+            return self.deserialize(raw_data, packed) if raw_data else None
         except RedisError as e:
             logger.warning(f"Redis get failed for key {key}: {e}")
             return None
@@ -147,11 +152,12 @@ class CacheManager:
         self,
         key: str,
         value: Any,
-        ttl_seconds: Optional[int] = None
+        ttl_seconds: Optional[int] = None,
+        packed: bool = False
     ) -> bool:
         """Set value in cache with automatic serialization"""
         try:
-            serialized_value = self.serialize(value)
+            serialized_value = self.serialize(value, packed)
             ttl = ttl_seconds or self.config.default_ttl_seconds
 
             await self._client.setex(key, ttl, serialized_value)
@@ -163,6 +169,18 @@ class CacheManager:
             logger.error(f"Cache set error for key {key}: {e}")
             return False
 
+    async def set_nx(self, key: str, value: Any, ttl_seconds: int) -> bool:
+        """Set value only if key does not exist (fails open on Redis errors)"""
+        try:
+            result = await self._client.set(key, self.serialize(value), nx=True, ex=ttl_seconds)
+            return bool(result)
+        except RedisError as e:
+            logger.warning(f"Redis set_nx failed for key {key}: {e}")
+            return True
+        except Exception as e:
+            logger.error(f"Cache set_nx error for key {key}: {e}")
+            return True
+
     async def delete(self, key: str) -> bool:
         """Delete key from cache"""
         try:
@@ -211,11 +229,11 @@ class CacheManager:
             return -1
 
     # Batch operations
-    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+    async def mget(self, keys: List[str], packed: bool = False) -> List[Optional[Any]]:
         """Get multiple values from cache"""
         try:
             raw_values = await self._client.mget(keys)
-            return [self.deserialize(val) if val else None for val in raw_values]
+            return [self.deserialize(val, packed) if val else None for val in raw_values]
         except RedisError as e:
             logger.warning(f"Redis mget failed: {e}")
             return [None] * len(keys)
@@ -223,12 +241,17 @@ class CacheManager:
             logger.error(f"Cache mget error: {e}")
             return [None] * len(keys)
 
-    async def mset(self, mapping: Dict[str, Any], ttl_seconds: Optional[int] = None) -> bool:
+    async def mset(
+        self,
+        mapping: Dict[str, Any],
+        ttl_seconds: Optional[int] = None,
+        packed: bool = False
+    ) -> bool:
         """Set multiple values in cache"""
         try:
             # Serialize all values
             serialized_mapping = {
-                key: self.serialize(value)
+                key: self.serialize(value, packed)
                 for key, value in mapping.items()
             }
 
@@ -341,15 +364,16 @@ class CacheKeyBuilder:
     @staticmethod
     def mpi_match_key(patient_data: Dict[str, Any]) -> str:
         """Generate cache key for MPI matching"""
-        key_fields = {
-            'ssn': patient_data.get('ssn', ''),
-            'first_name': patient_data.get('first_name', '').lower(),
-            'last_name': patient_data.get('last_name', '').lower(),
-            'dob': patient_data.get('dob', '')
-        }
-        key_string = orjson.dumps(key_fields, option=orjson.OPT_SORT_KEYS)
-        hash_key = hashlib.blake2b(key_string, digest_size=16).hexdigest()
-        return f"mpi:match:{hash_key}"
+        # Fixed field order joined as bytes - no JSON encoding or dict needed
+        key_bytes = b'|'.join((
+            str(patient_data.get('ssn') or '').encode(),
+            (patient_data.get('first_name') or '').lower().encode(),
+            (patient_data.get('last_name') or '').lower().encode(),
+            str(patient_data.get('dob') or '').encode()
+        ))
+        hash_key = hashlib.blake2b(key_bytes, digest_size=16).hexdigest()
+        # v2: values are msgpack-encoded (v1 entries were orjson)
+        return f"mpi:match:v2:{hash_key}"
 
     @staticmethod
     def patient_key(mpi_id: str) -> str:
@@ -451,7 +475,7 @@ class MatchingCache:
     async def get_match_result(self, patient_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Get cached match result"""
         cache_key = CacheKeyBuilder.mpi_match_key(patient_data)
-        return await self.cache_manager.get(cache_key)
+        return await self.cache_manager.get(cache_key, packed=True)
 
     async def cache_match_result(
         self,
@@ -460,7 +484,7 @@ class MatchingCache:
     ) -> bool:
         """Cache match result"""
         cache_key = CacheKeyBuilder.mpi_match_key(patient_data)
-        return await self.cache_manager.set(cache_key, result, self.ttl_seconds)
+        return await self.cache_manager.set(cache_key, result, self.ttl_seconds, packed=True)
 
     async def invalidate_patient_cache(self, mpi_id: str) -> int:
         """Invalidate all cached data for a patient"""
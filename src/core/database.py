@@ -2,6 +2,7 @@
 Database utility abstractions for MongoDB operations
 """
 
+import asyncio
 import logging
 from typing import Optional, Dict, Any, List, AsyncGenerator
 from datetime import datetime, timedelta
@@ -10,12 +11,95 @@ from functools import lru_cache
 
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
 import pymongo
+from pymongo.errors import BulkWriteError
 
 from .config import get_database_config, DatabaseConfig
 
 logger = logging.getLogger(__name__)
 
 
+class BulkWriter:
+    """
+    Write-behind buffer for fire-and-forget inserts.
+
+    Documents are queued without waiting on MongoDB and a background task
+    flushes them with insert_many(ordered=False) every flush_interval seconds
+    or max_batch documents, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        collection: AsyncIOMotorCollection,
+        max_batch: int = 500,
+        flush_interval: float = 0.05,
+        max_queue: int = 10_000
+    ):
+        self.collection = collection
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+    def start(self) -> None:
+        """Start the background flush task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    def put(self, document: Dict[str, Any]) -> bool:
+        """Queue a document for insertion; drops it if the queue is full"""
+        try:
+            self._queue.put_nowait(document)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+    async def stop(self) -> None:
+        """Flush everything queued and stop the background task"""
+        if self._task is None:
+            return
+        await self._queue.put(None)  # Sentinel - written after all queued docs
+        await self._task
+        self._task = None
+
+    async def _flush_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            document = await self._queue.get()
+            if document is None:
+                return
+
+            batch = [document]
+            stop = False
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    async with asyncio.timeout(timeout):
+                        document = await self._queue.get()
+                except asyncio.TimeoutError:
+                    break
+                if document is None:
+                    stop = True
+                    break
+                batch.append(document)
+
+            await self._write(batch)
+            if stop:
+                return
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            await self.collection.insert_many(batch, ordered=False)
+        except BulkWriteError as e:
+            logger.warning(f"Bulk insert into {self.collection.name} partially failed: {e.details.get('writeErrors', [])[:1]}")
+        except Exception as e:
+            logger.error(f"Bulk insert into {self.collection.name} failed: {e}")
+
+
 class DatabaseManager:
     """
     Centralized database connection and operation manager.
@@ -27,6 +111,7 @@ class DatabaseManager:
         self._client: Optional[AsyncIOMotorClient] = None
         self._database: Optional[AsyncIOMotorDatabase] = None
         self._collections: Dict[str, AsyncIOMotorCollection] = {}
+        self._bulk_writers: Dict[str, BulkWriter] = {}
         self._initialized = False
 
     async def initialize(self) -> None:
@@ -138,6 +223,11 @@ class DatabaseManager:
 
     async def cleanup(self) -> None:
         """Cleanup database connections"""
+        # Flush pending write-behind inserts before the client goes away
+        for writer in self._bulk_writers.values():
+            await writer.stop()
+        self._bulk_writers.clear()
+
         if self._client:
             self._client.close()
             self._initialized = False
@@ -168,6 +258,14 @@ class DatabaseManager:
         # Return collection directly from database for dynamic collections
         return self._database[name]
 
+    def get_bulk_writer(self, name: str) -> BulkWriter:
+        """Get the (lazily started) write-behind writer for a collection"""
+        writer = self._bulk_writers.get(name)
+        if writer is None:
+            writer = self._bulk_writers[name] = BulkWriter(self.get_collection(name))
+            writer.start()
+        return writer
+
     async def health_check(self) -> Dict[str, Any]:
         """Perform database health check"""
         try:
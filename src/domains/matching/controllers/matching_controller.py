@@ -5,7 +5,7 @@ Matching controller - HTTP endpoint handlers for matching operations
 from typing import Dict, Any
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Depends, Request
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, ORJSONResponse
 import json
 import logging
 
@@ -63,7 +63,9 @@ async def bulk_match(
             request.patients,
             request.return_phi
         )
-        return response
+        # Already a validated model - serialize straight to orjson rather
+        # than re-validating every result through response_model
+        return ORJSONResponse(content=response.model_dump())
 
     except Exception as e:
         logger.error(f"Error in bulk match: {e}")
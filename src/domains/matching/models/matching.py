@@ -3,19 +3,31 @@ Matching domain models
 """
 
 from typing import Dict, List, Any, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+
+def _normalize_ssn(patient_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Strip SSN formatting once at the edge so cache keys and hashes agree"""
+    ssn = patient_data.get("ssn")
+    if isinstance(ssn, str) and not ssn.isdigit():
+        patient_data["ssn"] = ''.join(c for c in ssn if c.isdigit())
+    return patient_data
 
 
 class PatientMatchRequest(BaseModel):
     """Single patient match request"""
     patient_data: Dict[str, Any] = Field(..., description="Patient demographic data")
 
+    _clean_ssn = field_validator("patient_data")(_normalize_ssn)
+
 
 class PatientWithCorrelationId(BaseModel):
     """Patient data with correlation ID for tracking"""
     correlation_id: str = Field(..., description="Unique ID to correlate request/response")
     patient_data: Dict[str, Any] = Field(..., description="Patient demographic data")
 
+    _clean_ssn = field_validator("patient_data")(_normalize_ssn)
+
 
 class BulkMatchRequest(BaseModel):
     """Bulk match request with correlation IDs"""
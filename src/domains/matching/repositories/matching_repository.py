@@ -2,8 +2,9 @@
 Matching repository - handles caching and persistence for matching operations
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
+import asyncio
 import hashlib
 import json
 import logging
@@ -15,6 +16,10 @@ from core.cache import CacheManager, MatchingCache, MetricsCache, CacheKeyBuilde
 
 logger = logging.getLogger(__name__)
 
+# Match results are cached in Redis as msgpack, which has no datetime type -
+# leave the bookkeeping timestamps out of MongoDB reads that backfill Redis
+_CACHE_PROJECTION = {"_id": 0, "created_at": 0, "expires_at": 0}
+
 
 class MatchingRepository(BaseRepository):
     """Repository for matching operations and caching"""
@@ -23,6 +28,7 @@ class MatchingRepository(BaseRepository):
         super().__init__(db_manager, "cache")
         self.cache_manager = cache_manager
         self.metrics_collection = db_manager.get_collection("metrics")
+        self.metrics_writer = db_manager.get_bulk_writer("metrics")
 
         # Initialize high-level cache utilities
         self.matching_cache = MatchingCache(cache_manager) if cache_manager else None
@@ -38,7 +44,7 @@ class MatchingRepository(BaseRepository):
             return None
 
         # Try Redis first (L2 cache)
-        result = await self.cache_manager.get(cache_key)
+        result = await self.cache_manager.get(cache_key, packed=True)
         if result:
             return result
 
@@ -46,17 +52,64 @@ class MatchingRepository(BaseRepository):
         try:
             mongo_result = await self.find_one(
                 {"request_hash": cache_key},
-                projection={"_id": 0, "expires_at": 0}
+                projection=_CACHE_PROJECTION
             )
             if mongo_result:
                 # Populate Redis cache
-                await self.cache_manager.set(cache_key, mongo_result, ttl_seconds=3600)
+                await self.cache_manager.set(cache_key, mongo_result, ttl_seconds=3600, packed=True)
                 return mongo_result
         except Exception as e:
             logger.warning(f"MongoDB cache get failed: {e}")
 
         return None
 
+    async def get_cached_matches(self, cache_keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Bulk variant of get_cached_match.
+
+        Resolves all keys with a single Redis MGET, then a single MongoDB
+        $in query for the keys Redis did not have. Returns only the hits.
+        """
+        if not self.cache_manager or not cache_keys:
+            return {}
+
+        found = {}
+
+        # L2: one MGET for the whole batch
+        values = await self.cache_manager.mget(cache_keys, packed=True)
+        for key, value in zip(cache_keys, values):
+            if value:
+                found[key] = value
+
+        # L3: one MongoDB query for the residual misses
+        missing = [key for key in cache_keys if key not in found]
+        if missing:
+            try:
+                docs = await self.find_many(
+                    {"request_hash": {"$in": missing}},
+                    projection=_CACHE_PROJECTION
+                )
+                backfill = {doc["request_hash"]: doc for doc in docs}
+                if backfill:
+                    found.update(backfill)
+                    # Populate Redis cache
+                    await self.cache_manager.mset(backfill, ttl_seconds=3600, packed=True)
+            except Exception as e:
+                logger.warning(f"MongoDB bulk cache get failed: {e}")
+
+        return found
+
+    async def acquire_fill_lock(self, cache_key: str, ttl_seconds: int = 5) -> bool:
+        """Claim the right to fill a missing cache entry across workers"""
+        if not self.cache_manager:
+            return True
+        return await self.cache_manager.set_nx(f"{cache_key}:lock", 1, ttl_seconds)
+
+    async def release_fill_lock(self, cache_key: str):
+        """Release a fill lock taken with acquire_fill_lock"""
+        if self.cache_manager:
+            await self.cache_manager.delete(f"{cache_key}:lock")
+
     async def set_cache(
         self,
         cache_key: str,
@@ -67,10 +120,20 @@ class MatchingRepository(BaseRepository):
         if not self.cache_manager:
             return
 
-        # Redis cache
-        await self.cache_manager.set(cache_key, result, ttl_seconds)
+        # Redis and MongoDB writes are independent - issue them concurrently
+        # so the miss path pays one round trip instead of two
+        await asyncio.gather(
+            self.cache_manager.set(cache_key, result, ttl_seconds, packed=True),
+            self._set_mongo_cache(cache_key, result, ttl_seconds)
+        )
 
-        # MongoDB cache with TTL
+    async def _set_mongo_cache(
+        self,
+        cache_key: str,
+        result: Dict[str, Any],
+        ttl_seconds: int
+    ):
+        """Persist cache entry in MongoDB with TTL"""
         try:
             await self.update_one(
                 {"request_hash": cache_key},
@@ -100,14 +163,15 @@ class MatchingRepository(BaseRepository):
             if self.metrics_cache:
                 await self.metrics_cache.record_metric(endpoint, response_time_ms, cache_hit, status)
 
-            # Also store in MongoDB for persistence
-            await self.metrics_collection.insert_one({
+            # Also store in MongoDB for persistence (write-behind, batched)
+            now = datetime.utcnow()
+            self.metrics_writer.put({
                 "endpoint": endpoint,
                 "response_time_ms": response_time_ms,
                 "cache_hit": cache_hit,
                 "status": status,
-                "timestamp": datetime.utcnow(),
-                "expires_at": datetime.utcnow() + timedelta(days=30)
+                "timestamp": now,
+                "expires_at": now + timedelta(days=30)
             })
         except Exception as e:
             logger.error(f"Failed to record metric: {e}")
@@ -2,12 +2,15 @@
 Matching service - business logic for patient matching
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from uuid import uuid4
 import time
 import asyncio
 import logging
+import weakref
+
+from cachetools import TTLCache
 
 from ..models.matching import (
     MatchResult,
@@ -20,6 +23,17 @@ from ..repositories.matching_repository import MatchingRepository
 
 logger = logging.getLogger(__name__)
 
+# L1 cache shared by all (per-request) service instances in this process,
+# bounded so memory stays predictable under load
+_memory_cache = TTLCache(maxsize=100_000, ttl=60)
+
+# Per-key locks coalescing concurrent misses within this process
+_fill_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+# How long/often a waiter re-checks the cache while another worker fills it
+_FILL_WAIT_RETRIES = 3
+_FILL_WAIT_SECONDS = 0.05
+
 
 class MatchingService:
     """Service layer for matching operations"""
@@ -27,13 +41,20 @@ class MatchingService:
     def __init__(self, repository: MatchingRepository, mpi_service):
         self.repository = repository
         self.mpi_service = mpi_service
-        self.memory_cache = {}  # L1 cache
+        self.memory_cache = _memory_cache  # L1 cache
 
     async def match_single_patient(
         self,
-        patient_data: Dict[str, Any]
+        patient_data: Dict[str, Any],
+        prefetched: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> MatchResult:
-        """Match a single patient and return MPI ID"""
+        """Match a single patient and return MPI ID
+
+        Args:
+            patient_data: Patient demographic data
+            prefetched: L2/L3 hits already resolved in bulk, keyed by cache key.
+                When given, a key missing from it is treated as a cache miss.
+        """
         start_time = time.perf_counter()
         cache_hit = False
 
@@ -41,26 +62,24 @@ class MatchingService:
             # Generate cache key
             cache_key = self.repository.generate_cache_key(patient_data)
 
-            # L1: Memory cache
-            if cache_key in self.memory_cache:
+            # L1: Memory cache (single lookup - an entry can expire between
+            # a membership test and the subscript)
+            result = self.memory_cache.get(cache_key)
+            if result is not None:
                 cache_hit = True
-                result = self.memory_cache[cache_key]
             else:
                 # L2/L3: Redis/MongoDB cache
-                cached = await self.repository.get_cached_match(cache_key)
+                if prefetched is not None:
+                    cached = prefetched.get(cache_key)
+                else:
+                    cached = await self.repository.get_cached_match(cache_key)
                 if cached:
                     cache_hit = True
                     result = cached
                     # Populate L1 cache
                     self.memory_cache[cache_key] = cached
                 else:
-                    # Call provider
-                    result = await self._call_provider(patient_data)
-
-                    # Cache result
-                    if result and not result.get("error"):
-                        await self.repository.set_cache(cache_key, result)
-                        self.memory_cache[cache_key] = result
+                    result, cache_hit = await self._fill_cache_miss(cache_key, patient_data)
 
             # Record metrics
             processing_time = (time.perf_counter() - start_time) * 1000
@@ -117,13 +136,23 @@ class MatchingService:
         for i in range(0, len(patients), batch_size):
             batch = patients[i:i + batch_size]
 
-            # Process batch concurrently
+            # Resolve L2/L3 for the whole batch in one MGET + one MongoDB query
+            cache_keys = [
+                self.repository.generate_cache_key(patient_record.patient_data)
+                for patient_record in batch
+            ]
+            prefetched = await self.repository.get_cached_matches(
+                [key for key in cache_keys if key not in self.memory_cache]
+            )
+
+            # Process batch concurrently - only cache misses reach the provider
             batch_tasks = []
             for patient_record in batch:
                 batch_tasks.append(
                     self._process_single_with_correlation(
                         patient_record.correlation_id,
-                        patient_record.patient_data
+                        patient_record.patient_data,
+                        prefetched
                     )
                 )
 
@@ -167,14 +196,15 @@ class MatchingService:
     async def _process_single_with_correlation(
         self,
         correlation_id: str,
-        patient_data: Dict[str, Any]
+        patient_data: Dict[str, Any],
+        prefetched: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> BulkMatchResult:
         """Process a single patient with correlation ID"""
         start_time = time.perf_counter()
 
         try:
             # Match patient
-            result = await self.match_single_patient(patient_data)
+            result = await self.match_single_patient(patient_data, prefetched)
 
             processing_time = (time.perf_counter() - start_time) * 1000
 
@@ -209,24 +239,63 @@ class MatchingService:
                 processing_time_ms=(time.perf_counter() - start_time) * 1000
             )
 
+    async def _fill_cache_miss(
+        self,
+        cache_key: str,
+        patient_data: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Resolve a cache miss, letting only one caller per key reach the provider.
+
+        Concurrent misses for the same key in this process wait on a shared
+        asyncio.Lock; across workers a short-lived Redis lock makes the others
+        poll the cache briefly before falling back to the provider themselves.
+
+        Returns:
+            Tuple of (result, served_from_cache)
+        """
+        lock = _fill_locks.get(cache_key)
+        if lock is None:
+            lock = _fill_locks[cache_key] = asyncio.Lock()
+
+        waited = lock.locked()
+        async with lock:
+            # Another coroutine may have filled the cache while we waited
+            if waited:
+                cached = self.memory_cache.get(cache_key) or \
+                    await self.repository.get_cached_match(cache_key)
+                if cached:
+                    self.memory_cache[cache_key] = cached
+                    return cached, True
+
+            got_lock = await self.repository.acquire_fill_lock(cache_key)
+            if not got_lock:
+                for _ in range(_FILL_WAIT_RETRIES):
+                    await asyncio.sleep(_FILL_WAIT_SECONDS)
+                    cached = await self.repository.get_cached_match(cache_key)
+                    if cached:
+                        self.memory_cache[cache_key] = cached
+                        return cached, True
+
+            try:
+                # Call provider
+                result = await self._call_provider(patient_data)
+
+                # Cache result
+                if result and not result.get("error"):
+                    await self.repository.set_cache(cache_key, result)
+                    self.memory_cache[cache_key] = result
+            finally:
+                if got_lock:
+                    await self.repository.release_fill_lock(cache_key)
+
+            return result, False
+
     async def _call_provider(self, patient_data: Dict[str, Any]) -> Dict[str, Any]:
         """Call the configured provider for matching"""
         try:
-            # Use the configured provider
-            if hasattr(self.mpi_service.provider, 'get_mpi_id'):
-                result = await self.mpi_service.provider.get_mpi_id(patient_data)
-
-                # Handle different response formats
-                if hasattr(result, 'to_dict'):
-                    return result.to_dict()
-                elif hasattr(result, 'dict'):
-                    return result.dict()
-                else:
-                    return result
-            else:
-                # Fallback to direct MPI service call
-                return await self.mpi_service.get_mpi_id(patient_data)
-
+            # Use the configured provider (result already converted to a dict)
+            return await self.mpi_service.get_mpi_id(patient_data)
         except Exception as e:
             logger.error(f"Provider call failed: {e}")
             return {"error": str(e)}
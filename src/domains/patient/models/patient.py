@@ -4,7 +4,7 @@ Patient domain models
 
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from dataclasses import dataclass
 
 
@@ -28,6 +28,12 @@ class PatientSearchRequest(BaseModel):
     fuzzy_match: bool = Field(default=True, description="Enable fuzzy matching")
     confidence_threshold: float = Field(default=0.8, ge=0.0, le=1.0)
 
+    @field_validator("ssn")
+    @classmethod
+    def _digits_only_ssn(cls, v: Optional[str]) -> Optional[str]:
+        """Normalize SSN once so downstream code can trust it is digits-only"""
+        return ''.join(c for c in v if c.isdigit()) if v else v
+
 
 class PatientResponse(BaseModel):
     """Patient response model"""
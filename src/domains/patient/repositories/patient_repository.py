@@ -256,5 +256,6 @@ class PatientRepository(BaseRepository):
     @staticmethod
     def hash_ssn(ssn: str) -> str:
         """Hash SSN for storage"""
-        clean_ssn = ''.join(filter(str.isdigit, ssn))
+        # Request models already strip formatting - only clean when needed
+        clean_ssn = ssn if ssn.isdigit() else ''.join(filter(str.isdigit, ssn))
         return hashlib.blake2b(clean_ssn.encode(), digest_size=16).hexdigest()
\ No newline at end of file
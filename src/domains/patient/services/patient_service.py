@@ -2,9 +2,12 @@
 Patient service - business logic layer
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
+from functools import lru_cache
+import heapq
 import logging
+import uuid
 import fuzzy
 
 from ..models.patient import (
@@ -19,6 +22,27 @@ from ..repositories.patient_repository import PatientRepository
 
 logger = logging.getLogger(__name__)
 
+_SOUNDEX = fuzzy.Soundex(4)
+
+
+@lru_cache(maxsize=65536)
+def _soundex_upper(name: str) -> str:
+    return _SOUNDEX(name)
+
+
+def _soundex_cached(name: str) -> str:
+    """Soundex code for a name, memoized per process (names repeat heavily)"""
+    return _soundex_upper(name.upper()) if name else ""
+
+
+def _normalize_and_key(ssn: str, first_name: str, last_name: str) -> Tuple[str, str, str]:
+    """SSN hash plus first/last name Soundex codes, computed once per request"""
+    return (
+        PatientRepository.hash_ssn(ssn),
+        _soundex_cached(first_name),
+        _soundex_cached(last_name)
+    )
+
 
 class PatientService:
     """Service layer for patient operations"""
@@ -26,7 +50,6 @@ class PatientService:
     def __init__(self, repository: PatientRepository, cache_service=None):
         self.repository = repository
         self.cache = cache_service
-        self.soundex = fuzzy.Soundex(4)
 
     async def get_patient_by_mpi(self, mpi_id: str) -> Optional[PatientResponse]:
         """Fetch patient by MPI ID"""
@@ -40,7 +63,7 @@ class PatientService:
         patient = await self.repository.find_by_mpi_id(mpi_id)
 
         if patient:
-            response = PatientResponse(
+            response = PatientResponse.model_construct(
                 mpi_id=patient.mpi_id,
                 confidence=patient.confidence,
                 source=patient.source,
@@ -75,9 +98,9 @@ class PatientService:
 
         if request.fuzzy_match:
             if request.first_name:
-                search_params["first_name_soundex"] = self.soundex(request.first_name)
+                search_params["first_name_soundex"] = _soundex_cached(request.first_name)
             if request.last_name:
-                search_params["last_name_soundex"] = self.soundex(request.last_name)
+                search_params["last_name_soundex"] = _soundex_cached(request.last_name)
 
         if request.dob:
             search_params["dob"] = request.dob
@@ -91,21 +114,21 @@ class PatientService:
         )
 
         # Filter by confidence threshold and convert to response
-        results = []
-        for patient in patients:
-            if patient.confidence >= request.confidence_threshold:
-                results.append(PatientResponse(
-                    mpi_id=patient.mpi_id,
-                    confidence=patient.confidence,
-                    source=patient.source,
-                    created_at=patient.created_at,
-                    updated_at=patient.updated_at
-                ))
-
-        # Sort by confidence
-        results.sort(key=lambda x: x.confidence or 0, reverse=True)
-
-        return results
+        # (repository data is trusted - skip per-result validation)
+        results = (
+            PatientResponse.model_construct(
+                mpi_id=patient.mpi_id,
+                confidence=patient.confidence,
+                source=patient.source,
+                created_at=patient.created_at,
+                updated_at=patient.updated_at
+            )
+            for patient in patients
+            if patient.confidence >= request.confidence_threshold
+        )
+
+        # Top results by confidence
+        return heapq.nlargest(limit, results, key=lambda x: x.confidence or 0)
 
     async def get_patient_identifiers(
         self,
@@ -116,7 +139,7 @@ class PatientService:
         identifiers = await self.repository.get_identifiers(mpi_id, system)
 
         return [
-            PatientIdentifier(
+            PatientIdentifier.model_construct(
                 system=id["system"],
                 value=id["value"]
             )
@@ -132,7 +155,7 @@ class PatientService:
         history = await self.repository.get_history(mpi_id, days)
 
         return [
-            PatientHistory(
+            PatientHistory.model_construct(
                 timestamp=entry["timestamp"],
                 action=entry["action"],
                 user=entry.get("user")
@@ -156,15 +179,16 @@ class PatientService:
             }
 
         # Update last verified timestamp
+        now = datetime.utcnow()
         await self.repository.update(
             mpi_id,
-            {"last_verified": datetime.utcnow()}
+            {"last_verified": now}
         )
 
         return {
             "mpi_id": mpi_id,
             "verified": True,
-            "timestamp": datetime.utcnow(),
+            "timestamp": now,
             "confidence": patient.confidence
         }
 
@@ -173,42 +197,47 @@ class PatientService:
         patient_data: Dict[str, Any]
     ) -> PatientResponse:
         """Create new patient or return existing match"""
+        ssn = patient_data.get("ssn") or ""
+        ssn_hash, first_soundex, last_soundex = _normalize_and_key(
+            ssn,
+            patient_data.get("first_name") or "",
+            patient_data.get("last_name") or ""
+        )
+
         # Check for existing match
-        if patient_data.get("ssn"):
-            ssn_hash = PatientRepository.hash_ssn(patient_data["ssn"])
+        if ssn:
             existing = await self.repository.find_by_ssn_hash(ssn_hash)
 
             if existing:
-                return PatientResponse(
+                return PatientResponse.model_construct(
                     mpi_id=existing.mpi_id,
                     confidence=existing.confidence,
                     source=existing.source
                 )
 
         # Create new patient
-        import uuid
-
         match_keys = {
-            "first_name_soundex": self.soundex(patient_data.get("first_name", "")),
-            "last_name_soundex": self.soundex(patient_data.get("last_name", "")),
-            "dob": patient_data.get("dob", ""),
-            "ssn_last4": patient_data.get("ssn", "")[-4:] if patient_data.get("ssn") else ""
+            "first_name_soundex": first_soundex,
+            "last_name_soundex": last_soundex,
+            "dob": patient_data.get("dob") or "",
+            "ssn_last4": ssn[-4:]
         }
 
+        now = datetime.utcnow()
         patient = PatientEntity(
             mpi_id=f"MPI-{uuid.uuid4().hex[:8].upper()}",
-            ssn_hash=PatientRepository.hash_ssn(patient_data.get("ssn", "")),
+            ssn_hash=ssn_hash,
             match_keys=match_keys,
             confidence=0.95,
             source="internal",
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
-            last_accessed=datetime.utcnow()
+            created_at=now,
+            updated_at=now,
+            last_accessed=now
         )
 
         await self.repository.create(patient)
 
-        return PatientResponse(
+        return PatientResponse.model_construct(
             mpi_id=patient.mpi_id,
             confidence=patient.confidence,
             source=patient.source,
@@ -4,22 +4,35 @@ Controller/Service/Repository Pattern
 """
 
 import os
+import sys
+import atexit
+import queue
 import asyncio
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from contextlib import asynccontextmanager
 from datetime import datetime
+from typing import Dict, Tuple
 
 # Performance optimizations
-try:
-    import uvloop
-    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
-    print("✓ Using uvloop for enhanced performance")
-except ImportError:
-    print("⚠ uvloop not installed, using standard asyncio")
-
-from fastapi import FastAPI
+# (ENVIRONMENT is read directly - config is not loaded yet at this point)
+if sys.platform != "win32":
+    try:
+        import uvloop
+        uvloop.install()
+        logging.getLogger(__name__).debug("uvloop enabled")
+    except ImportError:
+        if os.getenv("ENVIRONMENT", "development").lower() == "production":
+            raise RuntimeError("uvloop is required in production")
+        logging.getLogger(__name__).warning("uvloop not installed, using standard asyncio")
+
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import aiohttp
+import orjson
+from aiohttp.resolver import AsyncResolver
 
 # Core utilities
 from core.config import get_config, ApplicationConfig
@@ -33,23 +46,42 @@ from domains.admin.controllers.admin_controller import router as admin_router
 from domains.monitoring.controllers.monitoring_controller import router as monitoring_router
 from domains.config.controllers.config_controller import router as config_router
 
+def _configure_logging(logging_config) -> QueueListener:
+    """Route log records through a queue so handler I/O never blocks the event loop"""
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(logging_config.format))
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    logging.basicConfig(
+        level=getattr(logging, logging_config.level.upper()),
+        handlers=[QueueHandler(log_queue)]
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
 # Configure logging
 config = get_config()
-logging.basicConfig(
-    level=getattr(logging, config.logging.level.upper()),
-    format=config.logging.format
-)
+_IS_PROD = config.is_production()  # Fixed for the life of the process
+_configure_logging(config.logging)
 logger = logging.getLogger(__name__)
 
 
 class MPIServiceContext:
     """Centralized service context for dependency injection"""
 
+    # Connectors (with their resolvers) shared by every context in the process,
+    # keyed by pool settings so contexts reuse sockets and DNS/TLS state
+    _shared_connectors: Dict[Tuple[int, int, int], Tuple[aiohttp.TCPConnector, AsyncResolver]] = {}
+
     def __init__(self, config: ApplicationConfig):
         self.config = config
         self.http_session = None
         self.session = None  # Alias
         self.provider = None
+        self._result_to_dict = None
         self.start_time = datetime.utcnow()
         self._initialized = False
 
@@ -61,14 +93,11 @@ class MPIServiceContext:
         logger.info("Initializing MPI Service Context...")
 
         # Initialize HTTP session for external calls
-        connector = aiohttp.TCPConnector(
-            limit=self.config.http.max_pool_size,
-            limit_per_host=self.config.http.max_per_host,
-            ttl_dns_cache=self.config.http.ttl_dns_cache
-        )
+        connector = self._get_connector(self.config.http)
         timeout = aiohttp.ClientTimeout(total=self.config.http.total_timeout)
         self.http_session = aiohttp.ClientSession(
             connector=connector,
+            connector_owner=False,  # Shared - closed by close_shared_connectors
             timeout=timeout
         )
         self.session = self.http_session  # Alias
@@ -79,6 +108,32 @@ class MPIServiceContext:
         self._initialized = True
         logger.info("MPI Service Context initialized successfully")
 
+    @classmethod
+    def _get_connector(cls, http_config) -> aiohttp.TCPConnector:
+        """Get (or create) the shared connector for these pool settings"""
+        key = (http_config.max_pool_size, http_config.max_per_host, http_config.ttl_dns_cache)
+        entry = cls._shared_connectors.get(key)
+        if entry is None or entry[0].closed:
+            # aiodns-backed resolver keeps DNS on the event loop (no thread hop)
+            resolver = AsyncResolver()
+            connector = aiohttp.TCPConnector(
+                resolver=resolver,
+                use_dns_cache=True,
+                limit=http_config.max_pool_size,
+                limit_per_host=http_config.max_per_host,
+                ttl_dns_cache=http_config.ttl_dns_cache
+            )
+            entry = cls._shared_connectors[key] = (connector, resolver)
+        return entry[0]
+
+    @classmethod
+    async def close_shared_connectors(cls):
+        """Close all shared connectors and their resolvers"""
+        for connector, resolver in cls._shared_connectors.values():
+            await connector.close()
+            await resolver.close()
+        cls._shared_connectors.clear()
+
     async def _init_provider(self):
         """Initialize the configured provider"""
         provider_name = self.config.mpi_provider.provider_name
@@ -88,7 +143,8 @@ class MPIServiceContext:
             from providers import VeratoProvider
             self.provider = VeratoProvider(
                 api_key=self.config.mpi_provider.verato_api_key,
-                endpoint=self.config.mpi_provider.verato_endpoint
+                endpoint=self.config.mpi_provider.verato_endpoint,
+                session=self.http_session
             )
             await self.provider.initialize()
         elif provider_name == "hybrid":
@@ -100,6 +156,11 @@ class MPIServiceContext:
             self.provider = InternalMPIProvider(mpi_service=self)
             await self.provider.initialize()
 
+        # Every provider implements BaseMPIProvider and returns MPIResult, so
+        # the result conversion is fixed here instead of probed per request
+        from providers import MPIResult
+        self._result_to_dict = MPIResult.to_dict
+
     async def cleanup(self):
         """Cleanup all connections"""
         logger.info("Cleaning up MPI Service Context...")
@@ -114,16 +175,8 @@ class MPIServiceContext:
 
     async def get_mpi_id(self, patient_data):
         """Compatibility method for legacy code"""
-        if hasattr(self.provider, 'get_mpi_id'):
-            result = await self.provider.get_mpi_id(patient_data)
-            # Convert to dict if needed
-            if hasattr(result, 'to_dict'):
-                return result.to_dict()
-            elif hasattr(result, 'dict'):
-                return result.dict()
-            return result
-        else:
-            raise NotImplementedError("Provider does not implement get_mpi_id")
+        result = await self.provider.get_mpi_id(patient_data)
+        return self._result_to_dict(result)
 
     async def clear_all_caches(self):
         """Clear all cache levels"""
@@ -136,6 +189,59 @@ class MPIServiceContext:
             logger.error(f"Error clearing caches: {e}")
 
 
+class _CachedClock:
+    """Coarse UTC ISO timestamp refreshed in the background for cheap endpoints"""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.current_iso = datetime.utcnow().isoformat()
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._tick())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _tick(self):
+        while True:
+            self.current_iso = datetime.utcnow().isoformat()
+            await asyncio.sleep(self.interval)
+
+
+_clock = _CachedClock()
+
+
+def _build_static_payloads(app_config: ApplicationConfig):
+    """Serialize the process-constant /health and / payloads once"""
+    health = orjson.dumps({
+        "status": "healthy",
+        "version": app_config.app_version,
+        "provider": app_config.mpi_provider.provider_name,
+        "environment": app_config.environment,
+    })
+    # Open the object back up so the timestamp can be appended per request
+    health_prefix = health[:-1] + b',"timestamp":"'
+
+    root = orjson.dumps({
+        "service": app_config.app_name,
+        "version": app_config.app_version,
+        "environment": app_config.environment,
+        "architecture": "Domain-Driven Design",
+        "pattern": "Controller/Service/Repository",
+        "documentation": "/docs" if not _IS_PROD else "disabled in production",
+        "health": "/health"
+    })
+    return health_prefix, root
+
+
 # FastAPI application with lifecycle management
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -159,6 +265,9 @@ async def lifespan(app: FastAPI):
     app.state.mpi_service = MPIServiceContext(app_config)
     await app.state.mpi_service.initialize()
 
+    app.state.health_prefix, app.state.root_bytes = _build_static_payloads(app_config)
+    _clock.start()
+
     logger.info("MPI Service started successfully")
 
     yield
@@ -167,7 +276,9 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down MPI Service...")
 
     # Cleanup in reverse order
+    await _clock.stop()
     await app.state.mpi_service.cleanup()
+    await MPIServiceContext.close_shared_connectors()
     await cleanup_cache()
     await cleanup_database()
 
@@ -180,8 +291,9 @@ app = FastAPI(
     version=config.app_version,
     description="Master Patient Index Service with Domain-Driven Design",
     lifespan=lifespan,
-    docs_url="/docs" if not config.is_production() else None,
-    redoc_url="/redoc" if not config.is_production() else None,
+    default_response_class=ORJSONResponse,
+    docs_url="/docs" if not _IS_PROD else None,
+    redoc_url="/redoc" if not _IS_PROD else None,
     debug=config.debug
 )
 
@@ -194,6 +306,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses (OpenAPI schema, bulk results); /health and / stay uncompressed
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include domain routers
 app.include_router(patient_router)
 app.include_router(matching_router)
@@ -203,36 +318,35 @@ app.include_router(config_router)
 
 
 # Health check endpoint
-@app.get("/health")
+@app.get("/health", response_class=Response, response_model=None)
 async def health_check():
     """Basic health check endpoint"""
-    return {
-        "status": "healthy",
-        "version": config.app_version,
-        "provider": config.mpi_provider.provider_name,
-        "environment": config.environment,
-        "timestamp": datetime.utcnow()
-    }
+    # Only the timestamp varies - splice it into the prebuilt payload
+    return Response(
+        app.state.health_prefix + _clock.current_iso.encode() + b'"}',
+        media_type="application/json"
+    )
 
 
 # Root endpoint
-@app.get("/")
+@app.get("/", response_class=Response, response_model=None)
 async def root():
     """Root endpoint with service information"""
-    return {
-        "service": config.app_name,
-        "version": config.app_version,
-        "environment": config.environment,
-        "architecture": "Domain-Driven Design",
-        "pattern": "Controller/Service/Repository",
-        "documentation": "/docs" if not config.is_production() else "disabled in production",
-        "health": "/health"
-    }
+    return Response(app.state.root_bytes, media_type="application/json")
 
 
 if __name__ == "__main__":
     import uvicorn
 
+    # Prefer the C HTTP parser; make a fallback to h11 visible instead of silent
+    try:
+        import httptools  # noqa: F401
+        http_impl = "httptools"
+    except ImportError:
+        logger.warning("httptools not installed - using the pure-Python h11 HTTP parser")
+        http_impl = "h11"
+    logger.info(f"HTTP protocol implementation: {http_impl}")
+
     # Run with optimized settings from config
     uvicorn.run(
         "main:app",
@@ -240,6 +354,9 @@ if __name__ == "__main__":
         port=config.port,
         workers=config.workers if not config.debug else 1,
         loop="uvloop",
+        http=http_impl,
+        lifespan="on",
+        timeout_keep_alive=5,
         log_level=config.logging.level.lower(),
         access_log=config.debug,
         reload=config.debug
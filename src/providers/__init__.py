@@ -11,13 +11,40 @@ Available Providers:
 All providers implement the BaseMPIProvider interface for consistent integration.
 """
 
+import importlib
+from functools import lru_cache
+
 from .base_provider import BaseMPIProvider, MPIResult, ProviderConfig
-from .verato_provider import VeratoProvider, VeratoProviderConfig
-from .internal import InternalMPIProvider, InternalProviderConfig
-from .hybrid import HybridMPIProvider, HybridProviderConfig, HybridStrategy
 
-# Legacy compatibility - keep the original verato module available
-from .verato import VeratoModule, VeratoConfig
+# Provider implementations (and their heavy dependencies) are imported on
+# first attribute access - see __getattr__ below (PEP 562)
+_LAZY_EXPORTS = {
+    'VeratoProvider': '.verato_provider',
+    'VeratoProviderConfig': '.verato_provider',
+    'InternalMPIProvider': '.internal',
+    'InternalProviderConfig': '.internal',
+    'HybridMPIProvider': '.hybrid',
+    'HybridProviderConfig': '.hybrid',
+    'HybridStrategy': '.hybrid',
+
+    # Legacy compatibility - keep the original verato module available
+    'VeratoModule': '.verato',
+    'VeratoConfig': '.verato',
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_EXPORTS))
 
 __all__ = [
     # Base classes
@@ -36,14 +63,26 @@ __all__ = [
 
     # Legacy compatibility
     'VeratoModule',
-    'VeratoConfig'
+    'VeratoConfig',
+
+    # Registry
+    'PROVIDER_REGISTRY',
+    'REQUIRED_METHODS',
+    'get_provider_class',
+    'create_provider'
 ]
 
-# Provider registry for dynamic loading
+# Provider registry for dynamic loading ("module:attribute", resolved lazily)
 PROVIDER_REGISTRY = {
-    'verato': VeratoProvider,
-    'internal': InternalMPIProvider,
-    'hybrid': HybridMPIProvider
+    'verato': f'{__name__}.verato_provider:VeratoProvider',
+    'internal': f'{__name__}.internal:InternalMPIProvider',
+    'hybrid': f'{__name__}.hybrid:HybridMPIProvider'
+}
+
+# Methods every registered provider exposes. Only initialize/get_mpi_id are
+# abstract on BaseMPIProvider, so the full interface is spelled out here.
+REQUIRED_METHODS = frozenset(BaseMPIProvider.__abstractmethods__) | {
+    'batch_process', 'health_check', 'get_stats', 'cleanup'
 }
 
 def get_provider_class(provider_name: str):
@@ -65,7 +104,15 @@ def get_provider_class(provider_name: str):
         available = ', '.join(PROVIDER_REGISTRY.keys())
         raise ValueError(f"Unknown provider '{provider_name}'. Available providers: {available}")
 
-    return PROVIDER_REGISTRY[provider_name]
+    return _load_provider_class(PROVIDER_REGISTRY[provider_name])
+
+
+@lru_cache(maxsize=None)
+def _load_provider_class(path: str):
+    """Resolve a "module:attribute" registry entry once per process"""
+    module_name, class_name = path.split(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
 
 def create_provider(provider_name: str, config=None, **kwargs):
     """
@@ -6,14 +6,134 @@ This ensures consistent integration with the main MPI service.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
+import asyncio
 import logging
+import re
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Precompiled cleanup patterns used by _standardize_patient_data
+_SSN_SEPARATORS_RE = re.compile(r'[- ]')
+_NON_DIGIT_RE = re.compile(r'\D')
+
+# Placeholder values treated as missing
+_NULLISH = frozenset({'', 'nan', 'none', 'null', 'not-provided'})
+
+# Fields every provider requires (checked in _validate_patient_data)
+_REQUIRED_FIELDS = ('first_name', 'last_name')
+
+# Standardized fields that get name / phone cleanup
+_NAME_FIELDS = ('first_name', 'last_name', 'middle_name')
+_PHONE_FIELDS = ('home_phone', 'work_phone', 'cell_phone')
+
+# Standard field mappings used by _standardize_patient_data
+_FIELD_MAPPINGS = {
+    # Name fields
+    'patient_first_name': 'first_name',
+    'firstName': 'first_name',
+    'first': 'first_name',
+    'patient_last_name': 'last_name',
+    'lastName': 'last_name',
+    'last': 'last_name',
+    'patient_middle_name': 'middle_name',
+    'middleName': 'middle_name',
+    'middle': 'middle_name',
+
+    # DOB fields
+    'patient_dob': 'dob',
+    'dateOfBirth': 'dob',
+    'birth_date': 'dob',
+    'birthdate': 'dob',
+
+    # SSN fields
+    'patient_ssn': 'ssn',
+    'social_security_number': 'ssn',
+    'social_security': 'ssn',
+
+    # Address fields
+    'patient_address': 'address_1',
+    'patient_address_1': 'address_1',
+    'address': 'address_1',
+    'addressLine1': 'address_1',
+    'patient_city': 'city',
+    'patient_state': 'state',
+    'patient_zip': 'zip',
+    'postal_code': 'zip',
+    'postalCode': 'zip',
+    'zipcode': 'zip',
+
+    # Contact fields
+    'patient_phone': 'home_phone',
+    'phone': 'home_phone',
+    'phoneNumber': 'home_phone',
+    'patient_email': 'email',
+    'email_address': 'email',
+
+    # Gender
+    'patient_gender': 'gender',
+    'sex': 'gender',
+
+    # ID fields
+    'patient_id': 'patient_id',
+    'member_id': 'patient_id',
+    'unique_id': 'patient_id'
+}
+
+
+def _standardize(patient_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Standardize patient data format (see BaseMPIProvider._standardize_patient_data)"""
+    standardized = {}
+
+    # Apply mappings (globals bound to locals for the per-field loop)
+    mapping_get = _FIELD_MAPPINGS.get
+    nullish = _NULLISH
+    for original_key, value in patient_data.items():
+        if value and str(value).lower() not in nullish:
+            standardized[mapping_get(original_key, original_key)] = value
+
+    # Clean up name fields
+    standardized_get = standardized.get
+    for name_field in _NAME_FIELDS:
+        name = standardized_get(name_field)
+        if name is not None:
+            standardized[name_field] = str(name).strip().title()
+
+    # Clean up SSN
+    if 'ssn' in standardized:
+        ssn = _SSN_SEPARATORS_RE.sub('', str(standardized['ssn']))
+        if ssn.isdigit() and len(ssn) == 9:
+            standardized['ssn'] = f"{ssn[:3]}-{ssn[3:5]}-{ssn[5:]}"
+        else:
+            # Invalid SSN format, remove it
+            del standardized['ssn']
+
+    # Clean up phone numbers
+    for phone_field in _PHONE_FIELDS:
+        if phone_field in standardized:
+            phone = _NON_DIGIT_RE.sub('', str(standardized[phone_field]))
+            if len(phone) == 10:
+                standardized[phone_field] = f"({phone[:3]}) {phone[3:6]}-{phone[6:]}"
+            elif len(phone) == 11 and phone[0] == '1':
+                standardized[phone_field] = f"({phone[1:4]}) {phone[4:7]}-{phone[7:]}"
+            else:
+                # Invalid phone format, remove it
+                del standardized[phone_field]
+
+    return standardized
+
+
+@lru_cache(maxsize=4096)
+def _standardize_items(items: Tuple[Tuple[str, Any], ...]) -> Dict[str, Any]:
+    """Memoized _standardize keyed on the record's items"""
+    return _standardize(dict(items))
+
 
-@dataclass
+@dataclass(slots=True)
 class MPIResult:
     """Standardized MPI result structure"""
     mpi_id: Optional[str]
@@ -40,8 +160,12 @@ class MPIResult:
             result['error'] = self.error
         return result
 
+    def to_json(self) -> bytes:
+        """Serialize to JSON bytes for caching and persistence"""
+        return orjson.dumps(self.to_dict(), option=orjson.OPT_SERIALIZE_NUMPY)
 
-@dataclass
+
+@dataclass(slots=True)
 class ProviderConfig:
     """Base configuration for providers"""
     timeout_seconds: int = 30
@@ -69,6 +193,9 @@ class BaseMPIProvider(ABC):
     to ensure consistent integration with the MPI service.
     """
 
+    # Lets slotted subclasses (HybridMPIProvider) drop the instance __dict__
+    __slots__ = ('config', 'provider_name', '_initialized')
+
     def __init__(self, config: ProviderConfig = None):
         self.config = config or ProviderConfig()
         self.provider_name = self.__class__.__name__.replace('Provider', '').lower()
@@ -102,30 +229,37 @@ class BaseMPIProvider(ABC):
         """
         Process multiple patient records concurrently
 
-        Default implementation processes sequentially.
-        Providers can override this for optimized batch processing.
+        Default implementation runs get_mpi_id concurrently, bounded by
+        max_concurrent. Providers can override this for optimized batch processing.
 
         Args:
             patient_records: List of patient data dictionaries
             max_concurrent: Maximum concurrent requests
 
         Returns:
-            List of MPIResult objects
+            List of MPIResult objects (same order as patient_records)
         """
-        results = []
-        for patient in patient_records:
-            try:
-                result = await self.get_mpi_id(patient)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Batch processing error for patient: {e}")
-                results.append(MPIResult(
-                    mpi_id=None,
-                    confidence=0.0,
-                    provider=self.provider_name,
-                    source='error',
-                    error=str(e)
-                ))
+        # Fixed pool of max_concurrent workers pulling from a shared iterator:
+        # at most max_concurrent coroutines exist regardless of batch size
+        results: List[Optional[MPIResult]] = [None] * len(patient_records)
+        pending = iter(enumerate(patient_records))
+
+        async def worker():
+            for i, patient in pending:
+                try:
+                    results[i] = await self.get_mpi_id(patient)
+                except Exception as e:
+                    # Lazy %-formatting: only rendered if the record is emitted
+                    logger.error("Batch processing error for patient: %s", e)
+                    results[i] = MPIResult(
+                        mpi_id=None,
+                        confidence=0.0,
+                        provider=self.provider_name,
+                        source='error',
+                        error=str(e)
+                    )
+
+        await asyncio.gather(*(worker() for _ in range(min(max_concurrent, len(patient_records)))))
         return results
 
     async def health_check(self) -> Dict[str, Any]:
@@ -198,12 +332,13 @@ class BaseMPIProvider(ABC):
         Raises:
             ValueError: If required fields are missing
         """
-        required_fields = ['first_name', 'last_name']
-        missing_fields = [field for field in required_fields
-                         if not patient_data.get(field)]
+        # Fast path: no allocation when the record is valid
+        if patient_data.get('first_name') and patient_data.get('last_name'):
+            return
 
-        if missing_fields:
-            raise ValueError(f"Missing required fields: {missing_fields}")
+        missing_fields = [field for field in _REQUIRED_FIELDS
+                          if not patient_data.get(field)]
+        raise ValueError(f"Missing required fields: {missing_fields}")
 
     def _standardize_patient_data(self, patient_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -215,91 +350,12 @@ class BaseMPIProvider(ABC):
         Returns:
             Standardized patient data
         """
-        standardized = {}
-
-        # Standard field mappings
-        field_mappings = {
-            # Name fields
-            'patient_first_name': 'first_name',
-            'firstName': 'first_name',
-            'first': 'first_name',
-            'patient_last_name': 'last_name',
-            'lastName': 'last_name',
-            'last': 'last_name',
-            'patient_middle_name': 'middle_name',
-            'middleName': 'middle_name',
-            'middle': 'middle_name',
-
-            # DOB fields
-            'patient_dob': 'dob',
-            'dateOfBirth': 'dob',
-            'birth_date': 'dob',
-            'birthdate': 'dob',
-
-            # SSN fields
-            'patient_ssn': 'ssn',
-            'social_security_number': 'ssn',
-            'social_security': 'ssn',
-
-            # Address fields
-            'patient_address': 'address_1',
-            'patient_address_1': 'address_1',
-            'address': 'address_1',
-            'addressLine1': 'address_1',
-            'patient_city': 'city',
-            'patient_state': 'state',
-            'patient_zip': 'zip',
-            'postal_code': 'zip',
-            'postalCode': 'zip',
-            'zipcode': 'zip',
-
-            # Contact fields
-            'patient_phone': 'home_phone',
-            'phone': 'home_phone',
-            'phoneNumber': 'home_phone',
-            'patient_email': 'email',
-            'email_address': 'email',
-
-            # Gender
-            'patient_gender': 'gender',
-            'sex': 'gender',
-
-            # ID fields
-            'patient_id': 'patient_id',
-            'member_id': 'patient_id',
-            'unique_id': 'patient_id'
-        }
-
-        # Apply mappings
-        for original_key, value in patient_data.items():
-            standard_key = field_mappings.get(original_key, original_key)
-            if value and str(value).lower() not in ['', 'nan', 'none', 'null', 'not-provided']:
-                standardized[standard_key] = value
-
-        # Clean up name fields
-        for name_field in ['first_name', 'last_name', 'middle_name']:
-            if name_field in standardized:
-                standardized[name_field] = str(standardized[name_field]).strip().title()
-
-        # Clean up SSN
-        if 'ssn' in standardized:
-            ssn = str(standardized['ssn']).replace('-', '').replace(' ', '')
-            if ssn.isdigit() and len(ssn) == 9:
-                standardized['ssn'] = f"{ssn[:3]}-{ssn[3:5]}-{ssn[5:]}"
-            else:
-                # Invalid SSN format, remove it
-                del standardized['ssn']
-
-        # Clean up phone numbers
-        for phone_field in ['home_phone', 'work_phone', 'cell_phone']:
-            if phone_field in standardized:
-                phone = ''.join(filter(str.isdigit, str(standardized[phone_field])))
-                if len(phone) == 10:
-                    standardized[phone_field] = f"({phone[:3]}) {phone[3:6]}-{phone[6:]}"
-                elif len(phone) == 11 and phone[0] == '1':
-                    standardized[phone_field] = f"({phone[1:4]}) {phone[4:7]}-{phone[7:]}"
-                else:
-                    # Invalid phone format, remove it
-                    del standardized[phone_field]
-
-        return standardized
\ No newline at end of file
+        try:
+            # Keyed in input order: when aliases collide the last one wins
+            standardized = _standardize_items(tuple(patient_data.items()))
+        except TypeError:
+            # Unhashable values (nested structures) - standardize uncached
+            return _standardize(patient_data)
+
+        # Copy so callers can't mutate the cached record
+        return dict(standardized)
\ No newline at end of file
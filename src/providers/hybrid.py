@@ -6,12 +6,21 @@ Provides fallback capability and consensus-based matching.
 """
 
 import os
+import time
+import array
 import asyncio
+import hashlib
 import logging
+import uuid
+from contextvars import ContextVar
+from time import perf_counter_ns
 from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
+from types import MappingProxyType
+
+import orjson
+from cachetools import TTLCache
 
 from .base_provider import BaseMPIProvider, MPIResult, ProviderConfig
 from .verato import VeratoModule
@@ -19,6 +28,48 @@ from .internal import InternalMPIProvider, InternalProviderConfig
 
 logger = logging.getLogger(__name__)
 
+# Short per-request id, attached to request-path log records as 'req_id'
+_REQ_ID: ContextVar[str] = ContextVar('hybrid_req_id', default='-')
+
+# Shared, read-only defaults for HybridProviderConfig - assign a new value
+# instead of mutating these
+_DEFAULT_VERATO_CONFIG = MappingProxyType({})
+_DEFAULT_INTERNAL_CONFIG = InternalProviderConfig()
+
+# Sub-provider results are memoized briefly so repeated lookups of the same
+# patient (cross-validation, re-queries within a batch) share one call
+_CALL_CACHE_TTL_SECONDS = 60
+_CALL_CACHE_MAX_ENTRIES = 10_000
+
+# Records per sub-provider batch call in batch_process
+_BATCH_CHUNK_SIZE = 25
+
+# Indexes into HybridMPIProvider._ctr
+_CTR_VERATO, _CTR_INTERNAL, _CTR_CONSENSUS, _CTR_DISAGREE, _CTR_FALLBACK = range(5)
+
+# A match at this confidence cannot be beaten - best_confidence stops waiting
+_AUTHORITATIVE_CONFIDENCE = 0.999
+
+
+def _data_digest(patient_data: Dict[str, Any]) -> bytes:
+    """Order-independent digest of standardized patient data"""
+    return hashlib.blake2b(
+        orjson.dumps(patient_data, option=orjson.OPT_SORT_KEYS, default=str),
+        digest_size=16
+    ).digest()
+
+
+def _copy_health(health: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a health status down to the per-provider dicts"""
+    return {**health, 'providers': {name: dict(status) for name, status in health['providers'].items()}}
+
+
+@dataclass(frozen=True, slots=True)
+class _Req:
+    """Standardized patient data and its digest, computed once per request"""
+    data: Dict[str, Any]
+    fingerprint: bytes
+
 
 class HybridStrategy(Enum):
     """Hybrid matching strategies"""
@@ -29,7 +80,7 @@ class HybridStrategy(Enum):
     BEST_CONFIDENCE = "best_confidence"  # Use result with highest confidence
 
 
-@dataclass
+@dataclass(slots=True)
 class HybridProviderConfig(ProviderConfig):
     """Configuration for Hybrid MPI Provider"""
 
@@ -49,16 +100,19 @@ class HybridProviderConfig(ProviderConfig):
 
     # Performance settings
     parallel_timeout_seconds: int = 10
+    per_call_timeout_seconds: int = 5
     enable_cross_validation: bool = True
+    health_cache_ttl_seconds: float = 5.0
 
     def __post_init__(self):
-        super().__post_init__()
+        # Explicit base call - zero-arg super() breaks in slots=True dataclasses
+        ProviderConfig.__post_init__(self)
 
         if self.verato_config is None:
-            self.verato_config = {}
+            self.verato_config = _DEFAULT_VERATO_CONFIG
 
         if self.internal_config is None:
-            self.internal_config = InternalProviderConfig()
+            self.internal_config = _DEFAULT_INTERNAL_CONFIG
 
 
 class HybridMPIProvider(BaseMPIProvider):
@@ -72,6 +126,11 @@ class HybridMPIProvider(BaseMPIProvider):
     - Performance optimization with configurable timeouts
     """
 
+    __slots__ = (
+        'mpi_service', 'verato_provider', 'internal_provider', '_ctr',
+        '_strategy_dispatch', '_last_health', '_inflight', '_call_cache'
+    )
+
     def __init__(self, config: HybridProviderConfig = None, mpi_service=None):
         super().__init__(config or HybridProviderConfig())
         self.config: HybridProviderConfig = self.config
@@ -81,18 +140,34 @@ class HybridMPIProvider(BaseMPIProvider):
         self.verato_provider = None
         self.internal_provider = None
 
-        # Statistics
-        self.verato_calls = 0
-        self.internal_calls = 0
-        self.consensus_matches = 0
-        self.disagreements = 0
-        self.fallback_used = 0
+        # Statistics - one unsigned counter per _CTR_* index
+        self._ctr = array.array('Q', [0, 0, 0, 0, 0])
+
+        # Strategy -> handler, so get_mpi_id dispatches with one lookup
+        self._strategy_dispatch = {
+            HybridStrategy.VERATO_FIRST: self._verato_first_strategy,
+            HybridStrategy.INTERNAL_FIRST: self._internal_first_strategy,
+            HybridStrategy.PARALLEL: self._parallel_strategy,
+            HybridStrategy.CONSENSUS: self._consensus_strategy,
+            HybridStrategy.BEST_CONFIDENCE: self._best_confidence_strategy
+        }
+
+        # (checked_at, status) of the last health check, reused for a few seconds
+        self._last_health: Optional[Tuple[float, Dict[str, Any]]] = None
+
+        # Data digest -> running get_mpi_id work, shared by identical requests
+        self._inflight: Dict[bytes, asyncio.Task] = {}
+
+        # (provider, data digest) -> in-flight or finished task, bounded and expiring
+        self._call_cache: TTLCache = TTLCache(maxsize=_CALL_CACHE_MAX_ENTRIES, ttl=_CALL_CACHE_TTL_SECONDS)
 
     async def initialize(self) -> None:
         """Initialize both provider instances"""
         try:
             # Initialize Verato provider
-            self.verato_provider = VeratoModule()
+            session = getattr(self.mpi_service, 'session', None)
+            self.verato_provider = VeratoModule(session=session)
+            await self.verato_provider.create_indexes()
 
             # Initialize Internal provider
             self.internal_provider = InternalMPIProvider(
@@ -102,37 +177,25 @@ class HybridMPIProvider(BaseMPIProvider):
             await self.internal_provider.initialize()
 
             self._initialized = True
-            logger.info(f"Hybrid MPI Provider initialized with strategy: {self.config.strategy.value}")
+            logger.info("Hybrid MPI Provider initialized with strategy: %s", self.config.strategy.value)
 
         except Exception as e:
-            logger.error(f"Failed to initialize Hybrid MPI Provider: {e}")
+            logger.error("Failed to initialize Hybrid MPI Provider: %s", e)
             raise
 
     async def get_mpi_id(self, patient_data: Dict[str, Any]) -> MPIResult:
         """
         Get MPI ID using hybrid strategy
         """
+        _REQ_ID.set(uuid.uuid4().hex[:8])
         try:
             # Validate and standardize input
             self._validate_patient_data(patient_data)
             standardized_data = self._standardize_patient_data(patient_data)
-
-            # Select strategy
-            if self.config.strategy == HybridStrategy.VERATO_FIRST:
-                return await self._verato_first_strategy(standardized_data)
-            elif self.config.strategy == HybridStrategy.INTERNAL_FIRST:
-                return await self._internal_first_strategy(standardized_data)
-            elif self.config.strategy == HybridStrategy.PARALLEL:
-                return await self._parallel_strategy(standardized_data)
-            elif self.config.strategy == HybridStrategy.CONSENSUS:
-                return await self._consensus_strategy(standardized_data)
-            elif self.config.strategy == HybridStrategy.BEST_CONFIDENCE:
-                return await self._best_confidence_strategy(standardized_data)
-            else:
-                raise ValueError(f"Unknown hybrid strategy: {self.config.strategy}")
+            return await self._match(_Req(standardized_data, _data_digest(standardized_data)))
 
         except Exception as e:
-            logger.error(f"Hybrid MPI matching error: {e}")
+            logger.error("Hybrid MPI matching error: %s", e, extra={'req_id': _REQ_ID.get()})
             return MPIResult(
                 mpi_id=None,
                 confidence=0.0,
@@ -141,13 +204,36 @@ class HybridMPIProvider(BaseMPIProvider):
                 error=str(e)
             )
 
-    async def _verato_first_strategy(self, patient_data: Dict[str, Any]) -> MPIResult:
+    async def _match(self, request: _Req) -> MPIResult:
+        """Run the configured strategy for a standardized request"""
+        # Select strategy
+        handler = self._strategy_dispatch.get(self.config.strategy)
+        if handler is None:
+            raise ValueError(f"Unknown hybrid strategy: {self.config.strategy}")
+
+        # Identical concurrent requests (duplicate rows, retries) share one run
+        key = request.fingerprint
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(handler(request))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget_inflight(key, t))
+
+        result = await asyncio.shield(task)
+        return replace(result, metadata=dict(result.metadata))
+
+    def _forget_inflight(self, key: bytes, task: asyncio.Task):
+        """Drop a finished request from the in-flight table"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    async def _verato_first_strategy(self, request: _Req) -> MPIResult:
         """Try Verato first, fallback to internal if needed"""
-        start_time = datetime.utcnow()
+        start_ns = perf_counter_ns()
 
         # Try Verato first
-        verato_result = await self._call_verato(patient_data)
-        self.verato_calls += 1
+        verato_result = await self._call_verato(request)
+        self._ctr[_CTR_VERATO] += 1
 
         # Check if Verato result is acceptable
         if (verato_result.mpi_id and
@@ -155,50 +241,50 @@ class HybridMPIProvider(BaseMPIProvider):
 
             # Optionally cross-validate with internal
             if self.config.enable_cross_validation:
-                internal_result = await self._call_internal(patient_data)
-                self.internal_calls += 1
+                internal_result = await self._call_internal(request)
+                self._ctr[_CTR_INTERNAL] += 1
 
                 if self._validate_cross_results(verato_result, internal_result):
-                    self.consensus_matches += 1
+                    self._ctr[_CTR_CONSENSUS] += 1
                 else:
-                    self.disagreements += 1
+                    self._ctr[_CTR_DISAGREE] += 1
 
-            verato_result.metadata.update({
+            verato_result.metadata |= {
                 'strategy': 'verato_first',
                 'primary_provider': 'verato',
-                'processing_time_ms': (datetime.utcnow() - start_time).total_seconds() * 1000
-            })
+                'processing_time_ms': (perf_counter_ns() - start_ns) / 1_000_000
+            }
             return verato_result
 
         # Fallback to internal if enabled
         if self.config.enable_fallback:
-            self.fallback_used += 1
-            internal_result = await self._call_internal(patient_data)
-            self.internal_calls += 1
+            self._ctr[_CTR_FALLBACK] += 1
+            internal_result = await self._call_internal(request)
+            self._ctr[_CTR_INTERNAL] += 1
 
-            internal_result.metadata.update({
+            internal_result.metadata |= {
                 'strategy': 'verato_first_fallback',
                 'primary_provider': 'verato',
                 'fallback_provider': 'internal',
                 'fallback_reason': 'low_confidence' if verato_result.mpi_id else 'no_match',
-                'processing_time_ms': (datetime.utcnow() - start_time).total_seconds() * 1000
-            })
+                'processing_time_ms': (perf_counter_ns() - start_ns) / 1_000_000
+            }
             return internal_result
 
         # Return Verato result even if low confidence
-        verato_result.metadata.update({
+        verato_result.metadata |= {
             'strategy': 'verato_first_no_fallback',
-            'processing_time_ms': (datetime.utcnow() - start_time).total_seconds() * 1000
-        })
+            'processing_time_ms': (perf_counter_ns() - start_ns) / 1_000_000
+        }
         return verato_result
 
-    async def _internal_first_strategy(self, patient_data: Dict[str, Any]) -> MPIResult:
+    async def _internal_first_strategy(self, request: _Req) -> MPIResult:
         """Try internal first, fallback to Verato if needed"""
-        start_time = datetime.utcnow()
+        start_ns = perf_counter_ns()
 
         # Try internal first
-        internal_result = await self._call_internal(patient_data)
-        self.internal_calls += 1
+        internal_result = await self._call_internal(request)
+        self._ctr[_CTR_INTERNAL] += 1
 
         # Check if internal result is acceptable
         if (internal_result.mpi_id and
@@ -206,86 +292,98 @@ class HybridMPIProvider(BaseMPIProvider):
 
             # Optionally cross-validate with Verato
             if self.config.enable_cross_validation:
-                verato_result = await self._call_verato(patient_data)
-                self.verato_calls += 1
+                verato_result = await self._call_verato(request)
+                self._ctr[_CTR_VERATO] += 1
 
                 if self._validate_cross_results(internal_result, verato_result):
-                    self.consensus_matches += 1
+                    self._ctr[_CTR_CONSENSUS] += 1
                 else:
-                    self.disagreements += 1
+                    self._ctr[_CTR_DISAGREE] += 1
 
-            internal_result.metadata.update({
+            internal_result.metadata |= {
                 'strategy': 'internal_first',
                 'primary_provider': 'internal',
-                'processing_time_ms': (datetime.utcnow() - start_time).total_seconds() * 1000
-            })
+                'processing_time_ms': (perf_counter_ns() - start_ns) / 1_000_000
+            }
             return internal_result
 
         # Fallback to Verato if enabled
         if self.config.enable_fallback:
-            self.fallback_used += 1
-            verato_result = await self._call_verato(patient_data)
-            self.verato_calls += 1
+            self._ctr[_CTR_FALLBACK] += 1
+            verato_result = await self._call_verato(request)
+            self._ctr[_CTR_VERATO] += 1
 
-            verato_result.metadata.update({
+            verato_result.metadata |= {
                 'strategy': 'internal_first_fallback',
                 'primary_provider': 'internal',
                 'fallback_provider': 'verato',
                 'fallback_reason': 'low_confidence' if internal_result.mpi_id else 'no_match',
-                'processing_time_ms': (datetime.utcnow() - start_time).total_seconds() * 1000
-            })
+                'processing_time_ms': (perf_counter_ns() - start_ns) / 1_000_000
+            }
             return verato_result
 
         # Return internal result even if low confidence
-        internal_result.metadata.update({
+        internal_result.metadata |= {
             'strategy': 'internal_first_no_fallback',
-            'processing_time_ms': (datetime.utcnow() - start_time).total_seconds() * 1000
-        })
+            'processing_time_ms': (perf_counter_ns() - start_ns) / 1_000_000
+        }
         return internal_result
 
-    async def _parallel_strategy(self, patient_data: Dict[str, Any]) -> MPIResult:
+    async def _parallel_strategy(self, request: _Req) -> MPIResult:
         """Run both providers in parallel and choose best result"""
-        start_time = datetime.utcnow()
+        start_ns = perf_counter_ns()
 
         try:
             # Run both providers concurrently with timeout
-            verato_task = asyncio.create_task(self._call_verato(patient_data))
-            internal_task = asyncio.create_task(self._call_internal(patient_data))
-
-            # Wait for both with timeout
-            done, pending = await asyncio.wait(
-                [verato_task, internal_task],
-                timeout=self.config.parallel_timeout_seconds,
-                return_when=asyncio.ALL_COMPLETED
-            )
+            verato_task = asyncio.create_task(self._call_verato(request))
+            internal_task = asyncio.create_task(self._call_internal(request))
 
-            # Cancel any pending tasks
-            for task in pending:
-                task.cancel()
+            tasks = [verato_task, internal_task]
+
+            # Take results as they finish - stop at the first confident match
+            # instead of always waiting for the slower provider
+            timed_out = False
+            try:
+                for next_done in asyncio.as_completed(tasks, timeout=self.config.parallel_timeout_seconds):
+                    result = await next_done
+                    if (result.mpi_id and not result.error and
+                        result.confidence >= self.config.confidence_threshold):
+                        break
+            except asyncio.TimeoutError:
+                timed_out = True
+
+            # Cancel whichever provider is still running
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
 
             # Get results
             verato_result = None
             internal_result = None
 
-            if verato_task in done:
-                verato_result = await verato_task
-                self.verato_calls += 1
+            if verato_task.done() and not verato_task.cancelled():
+                verato_result = verato_task.result()
+                self._ctr[_CTR_VERATO] += 1
 
-            if internal_task in done:
-                internal_result = await internal_task
-                self.internal_calls += 1
+            if internal_task.done() and not internal_task.cancelled():
+                internal_result = internal_task.result()
+                self._ctr[_CTR_INTERNAL] += 1
 
             # Choose best result
             best_result = self._choose_best_result(verato_result, internal_result)
 
             if best_result:
-                best_result.metadata.update({
+                providers_called = []
+                if verato_result is not None:
+                    providers_called.append('verato')
+                if internal_result is not None:
+                    providers_called.append('internal')
+
+                best_result.metadata |= {
                     'strategy': 'parallel',
-                    'providers_called': [p for p in ['verato', 'internal']
-                                       if p in [r.provider if r else None
-                                              for r in [verato_result, internal_result]]],
-                    'processing_time_ms': (datetime.utcnow() - start_time).total_seconds() * 1000
-                })
+                    'providers_called': providers_called,
+                    'processing_time_ms': (perf_counter_ns() - start_ns) / 1_000_000
+                }
                 return best_result
 
             # No good results
@@ -296,13 +394,13 @@ class HybridMPIProvider(BaseMPIProvider):
                 source='parallel_no_results',
                 metadata={
                     'strategy': 'parallel',
-                    'timeout_occurred': len(pending) > 0,
-                    'processing_time_ms': (datetime.utcnow() - start_time).total_seconds() * 1000
+                    'timeout_occurred': timed_out,
+                    'processing_time_ms': (perf_counter_ns() - start_ns) / 1_000_000
                 }
             )
 
         except Exception as e:
-            logger.error(f"Parallel strategy error: {e}")
+            logger.error("Parallel strategy error: %s", e, extra={'req_id': _REQ_ID.get()})
             return MPIResult(
                 mpi_id=None,
                 confidence=0.0,
@@ -311,39 +409,39 @@ class HybridMPIProvider(BaseMPIProvider):
                 error=str(e),
                 metadata={
                     'strategy': 'parallel',
-                    'processing_time_ms': (datetime.utcnow() - start_time).total_seconds() * 1000
+                    'processing_time_ms': (perf_counter_ns() - start_ns) / 1_000_000
                 }
             )
 
-    async def _consensus_strategy(self, patient_data: Dict[str, Any]) -> MPIResult:
+    async def _consensus_strategy(self, request: _Req) -> MPIResult:
         """Require consensus between providers"""
-        start_time = datetime.utcnow()
+        start_ns = perf_counter_ns()
 
         # Run both providers
-        verato_result = await self._call_verato(patient_data)
-        internal_result = await self._call_internal(patient_data)
+        verato_result = await self._call_verato(request)
+        internal_result = await self._call_internal(request)
 
-        self.verato_calls += 1
-        self.internal_calls += 1
+        self._ctr[_CTR_VERATO] += 1
+        self._ctr[_CTR_INTERNAL] += 1
 
         # Check for consensus
         if self._check_consensus(verato_result, internal_result):
-            self.consensus_matches += 1
+            self._ctr[_CTR_CONSENSUS] += 1
 
             # Use the result with higher confidence
             best_result = verato_result if verato_result.confidence >= internal_result.confidence else internal_result
 
-            best_result.metadata.update({
+            best_result.metadata |= {
                 'strategy': 'consensus',
                 'consensus_achieved': True,
                 'both_providers_agree': True,
                 'verato_confidence': verato_result.confidence,
                 'internal_confidence': internal_result.confidence,
-                'processing_time_ms': (datetime.utcnow() - start_time).total_seconds() * 1000
-            })
+                'processing_time_ms': (perf_counter_ns() - start_ns) / 1_000_000
+            }
             return best_result
         else:
-            self.disagreements += 1
+            self._ctr[_CTR_DISAGREE] += 1
 
             # No consensus - return disagreement result
             return MPIResult(
@@ -359,56 +457,123 @@ class HybridMPIProvider(BaseMPIProvider):
                     'verato_confidence': verato_result.confidence,
                     'internal_confidence': internal_result.confidence,
                     'confidence_difference': abs(verato_result.confidence - internal_result.confidence),
-                    'processing_time_ms': (datetime.utcnow() - start_time).total_seconds() * 1000
+                    'processing_time_ms': (perf_counter_ns() - start_ns) / 1_000_000
                 }
             )
 
-    async def _best_confidence_strategy(self, patient_data: Dict[str, Any]) -> MPIResult:
+    async def _best_confidence_strategy(self, request: _Req) -> MPIResult:
         """Run both and return result with highest confidence"""
-        start_time = datetime.utcnow()
+        start_ns = perf_counter_ns()
 
         # Run both providers in parallel
-        verato_result = await self._call_verato(patient_data)
-        internal_result = await self._call_internal(patient_data)
+        verato_task = asyncio.create_task(self._call_verato(request))
+        internal_task = asyncio.create_task(self._call_internal(request))
+        tasks = [verato_task, internal_task]
+
+        # An authoritative match ends the race - cancel the other provider
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            if result.mpi_id and result.confidence >= _AUTHORITATIVE_CONFIDENCE:
+                break
+
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+        verato_result = verato_task.result() if verato_task.done() and not verato_task.cancelled() else None
+        internal_result = internal_task.result() if internal_task.done() and not internal_task.cancelled() else None
 
-        self.verato_calls += 1
-        self.internal_calls += 1
+        if verato_result:
+            self._ctr[_CTR_VERATO] += 1
+        if internal_result:
+            self._ctr[_CTR_INTERNAL] += 1
 
         # Choose result with highest confidence
-        if verato_result.confidence >= internal_result.confidence:
+        if verato_result is None or internal_result is None:
+            best_result = verato_result or internal_result
+            other_confidence = None
+        elif verato_result.confidence >= internal_result.confidence:
             best_result = verato_result
             other_confidence = internal_result.confidence
         else:
             best_result = internal_result
             other_confidence = verato_result.confidence
 
-        best_result.metadata.update({
+        best_result.metadata |= {
             'strategy': 'best_confidence',
             'chosen_provider': best_result.provider,
             'chosen_confidence': best_result.confidence,
             'other_confidence': other_confidence,
-            'confidence_difference': abs(verato_result.confidence - internal_result.confidence),
-            'processing_time_ms': (datetime.utcnow() - start_time).total_seconds() * 1000
-        })
+            'confidence_difference': (abs(best_result.confidence - other_confidence)
+                                      if other_confidence is not None else None),
+            'processing_time_ms': (perf_counter_ns() - start_ns) / 1_000_000
+        }
 
         return best_result
 
-    async def _call_verato(self, patient_data: Dict[str, Any]) -> MPIResult:
+    async def _call_verato(self, request: _Req) -> MPIResult:
+        """Call Verato provider, sharing recent and in-flight identical calls"""
+        return await self._memoized_call('verato', self._invoke_verato, request)
+
+    async def _call_internal(self, request: _Req) -> MPIResult:
+        """Call internal provider, sharing recent and in-flight identical calls"""
+        return await self._memoized_call('internal', self._invoke_internal, request)
+
+    async def _memoized_call(self, provider_name: str, call, request: _Req) -> MPIResult:
+        """Single-flight, short-TTL memoization of a sub-provider call"""
+        key = (provider_name, request.fingerprint)
+
+        task = self._call_cache.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call(request.data))
+            task.add_done_callback(lambda t: self._forget_failed_call(key, t))
+            self._call_cache[key] = task
+
+        # Shielded so a cancelled caller does not cancel the call for the others
+        result = await asyncio.shield(task)
+
+        # Strategies annotate metadata in place - hand out copies
+        return replace(result, metadata=dict(result.metadata))
+
+    def _seed_call_cache(self, provider_name: str, requests: List[_Req],
+                         results: List[MPIResult]):
+        """Store batch results so per-record strategy calls reuse them"""
+        loop = asyncio.get_running_loop()
+        for request, result in zip(requests, results):
+            if result.error:
+                continue
+            future = loop.create_future()
+            future.set_result(result)
+            self._call_cache[(provider_name, request.fingerprint)] = future
+
+    def _forget_failed_call(self, key: Tuple[str, bytes], task: asyncio.Task):
+        """Drop cancelled and error results so the next caller retries"""
+        if task.cancelled() or task.exception() is not None or task.result().error:
+            if self._call_cache.get(key) is task:
+                del self._call_cache[key]
+
+    def clear_call_cache(self):
+        """Forget all memoized sub-provider results"""
+        self._call_cache.clear()
+
+    async def _invoke_verato(self, patient_data: Dict[str, Any]) -> MPIResult:
         """Call Verato provider with error handling"""
         try:
             # Convert to old format for compatibility
-            old_result = await self.verato_provider.get_mpi_id(patient_data)
-
+            async with asyncio.timeout(self.config.per_call_timeout_seconds):
+                old_result = await self.verato_provider.get_mpi_id(patient_data)
+            return self._from_verato_result(old_result)
+        except asyncio.TimeoutError:
+            logger.warning("Verato provider timed out", extra={'req_id': _REQ_ID.get()})
             return MPIResult(
-                mpi_id=old_result.get('verato_id'),
-                confidence=old_result.get('confidence', 0.0),
+                mpi_id=None,
+                confidence=0.0,
                 provider='verato',
-                source=old_result.get('source', 'api'),
-                metadata=old_result.get('metadata', {}),
-                error=old_result.get('error')
+                source='timeout',
+                error='provider timeout'
             )
         except Exception as e:
-            logger.error(f"Verato provider error: {e}")
+            logger.error("Verato provider error: %s", e, extra={'req_id': _REQ_ID.get()})
             return MPIResult(
                 mpi_id=None,
                 confidence=0.0,
@@ -417,12 +582,51 @@ class HybridMPIProvider(BaseMPIProvider):
                 error=str(e)
             )
 
-    async def _call_internal(self, patient_data: Dict[str, Any]) -> MPIResult:
+    @staticmethod
+    def _from_verato_result(old_result: Dict[str, Any]) -> MPIResult:
+        """Convert a legacy VeratoModule result dict to MPIResult"""
+        return MPIResult(
+            mpi_id=old_result.get('verato_id'),
+            confidence=old_result.get('confidence', 0.0),
+            provider='verato',
+            source=old_result.get('source', 'api'),
+            metadata=old_result.get('metadata', {}),
+            error=old_result.get('error')
+        )
+
+    async def _call_verato_batch(self, records: List[Dict[str, Any]]) -> List[MPIResult]:
+        """Call Verato for a chunk of records in one batch"""
+        try:
+            old_results = await self.verato_provider.batch_process(records, len(records))
+            return [self._from_verato_result(old_result) for old_result in old_results]
+        except Exception as e:
+            logger.warning("Verato batch call failed, falling back to per-record calls: %s", e, extra={'req_id': _REQ_ID.get()})
+            return await asyncio.gather(*(self._invoke_verato(record) for record in records))
+
+    async def _call_internal_batch(self, records: List[Dict[str, Any]]) -> List[MPIResult]:
+        """Call internal provider for a chunk of records in one batch"""
+        try:
+            return await self.internal_provider.batch_process(records, len(records))
+        except Exception as e:
+            logger.warning("Internal batch call failed, falling back to per-record calls: %s", e, extra={'req_id': _REQ_ID.get()})
+            return await asyncio.gather(*(self._invoke_internal(record) for record in records))
+
+    async def _invoke_internal(self, patient_data: Dict[str, Any]) -> MPIResult:
         """Call internal provider with error handling"""
         try:
-            return await self.internal_provider.get_mpi_id(patient_data)
+            async with asyncio.timeout(self.config.per_call_timeout_seconds):
+                return await self.internal_provider.get_mpi_id(patient_data)
+        except asyncio.TimeoutError:
+            logger.warning("Internal provider timed out", extra={'req_id': _REQ_ID.get()})
+            return MPIResult(
+                mpi_id=None,
+                confidence=0.0,
+                provider='internal',
+                source='timeout',
+                error='provider timeout'
+            )
         except Exception as e:
-            logger.error(f"Internal provider error: {e}")
+            logger.error("Internal provider error: %s", e, extra={'req_id': _REQ_ID.get()})
             return MPIResult(
                 mpi_id=None,
                 confidence=0.0,
@@ -473,22 +677,54 @@ class HybridMPIProvider(BaseMPIProvider):
 
     async def batch_process(self, patient_records: List[Dict[str, Any]],
                           max_concurrent: int = 40) -> List[MPIResult]:
-        """Optimized batch processing for hybrid provider"""
+        """
+        Optimized batch processing for hybrid provider
 
-        semaphore = asyncio.Semaphore(max_concurrent)
+        Records are sent to the sub-providers in chunks of _BATCH_CHUNK_SIZE
+        and the results seed the call cache, so the per-record strategy run
+        afterwards reuses them instead of issuing one call per record.
+        """
+        prefetch_verato, prefetch_internal = self._batch_prefetch_plan()
+        semaphore = asyncio.Semaphore(max(1, max_concurrent // _BATCH_CHUNK_SIZE))
 
-        async def process_with_limit(patient_data):
+        async def process_chunk(chunk):
             async with semaphore:
-                return await self.get_mpi_id(patient_data)
-
-        tasks = [process_with_limit(patient) for patient in patient_records]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+                # Standardize and fingerprint each record once for the whole chunk
+                requests = []
+                for patient_data in chunk:
+                    try:
+                        self._validate_patient_data(patient_data)
+                        standardized_data = self._standardize_patient_data(patient_data)
+                        requests.append(_Req(standardized_data, _data_digest(standardized_data)))
+                    except Exception:
+                        requests.append(None)  # get_mpi_id reports the validation error
+
+                valid = [request for request in requests if request is not None]
+                if valid:
+                    batches = []
+                    if prefetch_verato:
+                        batches.append(self._prefetch('verato', self._call_verato_batch, valid))
+                    if prefetch_internal:
+                        batches.append(self._prefetch('internal', self._call_internal_batch, valid))
+                    await asyncio.gather(*batches)
+
+                return await asyncio.gather(
+                    *(self._match(request) if request is not None else self.get_mpi_id(patient_data)
+                      for request, patient_data in zip(requests, chunk)),
+                    return_exceptions=True
+                )
+
+        chunk_results = await asyncio.gather(*(
+            process_chunk(patient_records[i:i + _BATCH_CHUNK_SIZE])
+            for i in range(0, len(patient_records), _BATCH_CHUNK_SIZE)
+        ))
+        results = [result for chunk in chunk_results for result in chunk]
 
         # Handle any exceptions
         processed_results = []
         for i, result in enumerate(results):
             if isinstance(result, Exception):
-                logger.error(f"Hybrid batch processing error for record {i}: {result}")
+                logger.error("Hybrid batch processing error for record %d: %s", i, result)
                 processed_results.append(MPIResult(
                     mpi_id=None,
                     confidence=0.0,
@@ -501,23 +737,43 @@ class HybridMPIProvider(BaseMPIProvider):
 
         return processed_results
 
+    async def _prefetch(self, provider_name: str, batch_call, requests: List[_Req]):
+        """Run a sub-provider batch call and seed the call cache with it"""
+        results = await batch_call([request.data for request in requests])
+        self._seed_call_cache(provider_name, requests, results)
+
+    def _batch_prefetch_plan(self) -> Tuple[bool, bool]:
+        """Which sub-providers every record is certain to hit under the current strategy"""
+        strategy = self.config.strategy
+        # Primary-first strategies reach the secondary on both branches only
+        # when cross-validation and fallback are both on
+        secondary_always = self.config.enable_cross_validation and self.config.enable_fallback
+
+        if strategy == HybridStrategy.VERATO_FIRST:
+            return True, secondary_always
+        if strategy == HybridStrategy.INTERNAL_FIRST:
+            return secondary_always, True
+        return True, True
+
     def get_stats(self) -> Dict[str, Any]:
         """Get comprehensive hybrid provider statistics"""
         base_stats = super().get_stats()
 
-        total_calls = self.verato_calls + self.internal_calls
-        consensus_rate = self.consensus_matches / max(self.verato_calls, 1)
-        disagreement_rate = self.disagreements / max(self.verato_calls, 1)
-        fallback_rate = self.fallback_used / max(total_calls, 1)
+        verato_calls, internal_calls, consensus_matches, disagreements, fallback_used = self._ctr.tolist()
+
+        total_calls = verato_calls + internal_calls
+        consensus_rate = consensus_matches / max(verato_calls, 1)
+        disagreement_rate = disagreements / max(verato_calls, 1)
+        fallback_rate = fallback_used / max(total_calls, 1)
 
         hybrid_stats = {
             'strategy': self.config.strategy.value,
             'total_calls': total_calls,
-            'verato_calls': self.verato_calls,
-            'internal_calls': self.internal_calls,
-            'consensus_matches': self.consensus_matches,
-            'disagreements': self.disagreements,
-            'fallback_used': self.fallback_used,
+            'verato_calls': verato_calls,
+            'internal_calls': internal_calls,
+            'consensus_matches': consensus_matches,
+            'disagreements': disagreements,
+            'fallback_used': fallback_used,
             'consensus_rate': consensus_rate,
             'disagreement_rate': disagreement_rate,
             'fallback_rate': fallback_rate,
@@ -527,7 +783,7 @@ class HybridMPIProvider(BaseMPIProvider):
 
         # Include sub-provider stats
         if self.verato_provider:
-            hybrid_stats['verato_stats'] = getattr(self.verato_provider, 'get_stats', lambda: {})()
+            hybrid_stats['verato_stats'] = self.verato_provider.get_stats()
 
         if self.internal_provider:
             hybrid_stats['internal_stats'] = self.internal_provider.get_stats()
@@ -537,6 +793,10 @@ class HybridMPIProvider(BaseMPIProvider):
 
     async def health_check(self) -> Dict[str, Any]:
         """Check health of both providers"""
+        now = time.monotonic()
+        if self._last_health and now - self._last_health[0] < self.config.health_cache_ttl_seconds:
+            return _copy_health(self._last_health[1])
+
         health_status = {
             'status': 'healthy',
             'provider': 'hybrid',
@@ -547,15 +807,11 @@ class HybridMPIProvider(BaseMPIProvider):
         # Check Verato provider
         try:
             if self.verato_provider:
-                # Test with minimal data
-                test_result = await self._call_verato({
-                    'first_name': 'TEST',
-                    'last_name': 'PATIENT',
-                    'dob': '2000-01-01'
-                })
+                # Ping the backing stores instead of running a full match
+                await self._ping_verato()
                 health_status['providers']['verato'] = {
-                    'status': 'healthy' if not test_result.error else 'unhealthy',
-                    'error': test_result.error
+                    'status': 'healthy',
+                    'error': None
                 }
             else:
                 health_status['providers']['verato'] = {
@@ -564,7 +820,7 @@ class HybridMPIProvider(BaseMPIProvider):
         except Exception as e:
             health_status['providers']['verato'] = {
                 'status': 'unhealthy',
-                'error': str(e)
+                'error': str(e) or type(e).__name__
             }
 
         # Check Internal provider
@@ -589,21 +845,34 @@ class HybridMPIProvider(BaseMPIProvider):
         elif 'not_initialized' in provider_statuses:
             health_status['status'] = 'partial'
 
+        # Callers get their own copy so annotating a result never alters the cache
+        self._last_health = (now, _copy_health(health_status))
         return health_status
 
+    async def _ping_verato(self, timeout_seconds: float = 0.2):
+        """Ping the Verato module's MongoDB and Redis connections"""
+        async with asyncio.timeout(timeout_seconds):
+            await asyncio.gather(
+                self.verato_provider.mongo_client.admin.command('ping'),
+                self.verato_provider.redis_client.ping()
+            )
+
     async def cleanup(self) -> None:
         """Cleanup all provider resources"""
+        self.clear_call_cache()
+
         if self.internal_provider:
             await self.internal_provider.cleanup()
 
-        # Verato provider doesn't have async cleanup
+        # Verato provider is the bare VeratoModule (no cleanup())
         if self.verato_provider:
             try:
+                await self.verato_provider.close()
                 if hasattr(self.verato_provider, 'mongo_client'):
                     self.verato_provider.mongo_client.close()
                 if hasattr(self.verato_provider, 'redis_client'):
-                    self.verato_provider.redis_client.close()
+                    await self.verato_provider.redis_client.aclose()
             except Exception as e:
-                logger.warning(f"Error cleaning up Verato provider: {e}")
+                logger.warning("Error cleaning up Verato provider: %s", e)
 
         await super().cleanup()
\ No newline at end of file
@@ -7,27 +7,258 @@ or for fallback scenarios.
 """
 
 import os
+import re
 import hashlib
-import uuid
 import asyncio
 import logging
+from collections import defaultdict
+from contextvars import ContextVar
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import groupby
+from time import perf_counter_ns
 
-import pymongo
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
 import redis.asyncio as redis
 from fuzzywuzzy import fuzz
 import pandas as pd
 import numpy as np
+import orjson
+
+try:
+    # Native scorers: every candidate scored in one call per field
+    from rapidfuzz import fuzz as rfuzz, process as rprocess, utils as rutils
+except ImportError:
+    rprocess = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 from .base_provider import BaseMPIProvider, MPIResult, ProviderConfig
 
 logger = logging.getLogger(__name__)
 
+# Scoring rules shared by _calculate_match_score and _score_candidates
+_EXACT_SCORE_FIELDS = frozenset({'dob', 'ssn'})
+_NAME_SCORE_FIELDS = frozenset({'first_name', 'last_name'})
+_MIN_FIELD_SIMILARITY = 70
+
+# Pre-normalized copies stored on each patient document (see _store_new_patient)
+_NORM_FIELDS = {'first_name': 'first_name_norm', 'last_name': 'last_name_norm'}
+
+# Soundex lookup for ASCII codes: 1-6 consonant digit, 7 vowel, 0 ignored
+_SOUNDEX_LUT = np.zeros(128, dtype=np.uint8)
+for _letters, _code in (('BFPV', 1), ('CGJKQSXZ', 2), ('DT', 3), ('L', 4), ('MN', 5), ('R', 6), ('AEIOUY', 7)):
+    for _letter in _letters:
+        _SOUNDEX_LUT[ord(_letter)] = _code
+
+
+def _soundex_digits(chars, lut):
+    """
+    Soundex digits of an uppercased ASCII name, as a 3-digit integer.
+
+    Mirrors InternalMPIProvider._soundex: vowels separate repeated codes,
+    other characters are skipped, and the first letter never suppresses
+    the code that follows it.
+    """
+    packed = 0
+    count = 0
+    last = 255
+    for k in range(1, chars.shape[0]):
+        code = int(lut[chars[k]])
+        if code == 0:
+            continue
+        if code == 7:
+            last = 0
+            continue
+        if code != last:
+            last = code
+            if count < 3:
+                packed = packed * 10 + code
+                count += 1
+    while count < 3:
+        packed *= 10
+        count += 1
+    return packed
+
+
+_soundex_kernel = njit(cache=True)(_soundex_digits) if njit is not None else None
+
+# Pure-Python path: every ASCII character maps to its digit, '0' for vowels,
+# or is deleted; whatever survives outside 0-6 is non-ASCII and dropped too
+_SOUNDEX_TRANS = str.maketrans({chr(i): None for i in range(128)})
+_SOUNDEX_TRANS.update(str.maketrans(
+    'BFPVCGJKQSXZDTLMNRAEIOUY', '111122222222334556000000'
+))
+_NON_SOUNDEX_CODE = re.compile(r'[^0-6]')
+
+
+@lru_cache(maxsize=65536)
+def _soundex_code(word: str) -> str:
+    """Soundex code of a name, memoized since surnames recur across queries"""
+    if not word:
+        return ''
+
+    word = word.upper()
+
+    # JIT kernel over the ASCII bytes; a leading digit interacts with the
+    # digit codes below, so those (odd) names stay on the Python path
+    if _soundex_kernel is not None and word.isascii() and word[0].isalpha():
+        digits = _soundex_kernel(np.frombuffer(word.encode('ascii'), dtype=np.uint8), _SOUNDEX_LUT)
+        return f"{word[0]}{digits:03d}"
+
+    # Replace consonants with digits and vowels with '0' in one C pass
+    coded = word[1:].translate(_SOUNDEX_TRANS)
+    if not coded.isascii():
+        coded = _NON_SOUNDEX_CODE.sub('', coded)
+
+    # Keep first letter; avoid consecutive duplicates (vowels separate)
+    result = ''.join(code for code, _ in groupby(word[0] + coded))
+
+    # Remove zeros and pad/truncate to 4 characters
+    result = result.replace('0', '')
+    return (result + '000')[:4]
+
+_sha256 = hashlib.sha256
+_blake2b = hashlib.blake2b
+
+# Set by batch_process: cache reads were already pipelined, and writes are
+# collected here for one pipelined flush instead of a SETEX per record
+_batch_cache_writes: ContextVar[Optional[list]] = ContextVar('internal_batch_cache_writes', default=None)
+
+# Only the fields candidate scoring reads
+_CANDIDATE_PROJECTION = {
+    '_id': 0, 'internal_mpi_id': 1, 'dob': 1,
+    'first_name': 1, 'last_name': 1, 'first_name_norm': 1, 'last_name_norm': 1
+}
+
+# Batch prefetch also resolves exact matches and soundex buckets in memory
+_BATCH_PROJECTION = {**_CANDIDATE_PROJECTION, 'ssn_hash': 1, 'confidence_score': 1, 'last_name_soundex': 1}
+_EXACT_MATCH_FIELDS = ('internal_mpi_id', 'confidence_score', 'ssn_hash')
+_MAX_FUZZY_CANDIDATES = 100
+# Batch prefetches that would pull more documents than this fall back to
+# per-record queries instead of loading them into memory
+_MAX_BATCH_PREFETCH_DOCS = 10_000
+
+
+class _BatchCandidates:
+    """Patient documents prefetched for a whole batch, indexed for in-memory matching"""
+
+    __slots__ = ('mpi_ids', 'by_ssn_hash', 'by_demographics', 'by_soundex')
+
+    def __init__(self):
+        self.mpi_ids = set()
+        self.by_ssn_hash = {}
+        self.by_demographics = defaultdict(list)
+        self.by_soundex = defaultdict(list)
+
+    def add(self, doc: Dict[str, Any]):
+        """Index a patient document (documents already seen are skipped)"""
+        mpi_id = doc.get('internal_mpi_id')
+        if mpi_id in self.mpi_ids:
+            return
+        self.mpi_ids.add(mpi_id)
+
+        if doc.get('ssn_hash'):
+            self.by_ssn_hash.setdefault(doc['ssn_hash'], doc)
+        self.by_demographics[(doc.get('first_name'), doc.get('last_name'), doc.get('dob'))].append(doc)
+        self.by_soundex[doc.get('last_name_soundex')].append(doc)
+
+    def exact_match(self, ssn_hash: Optional[str], first_name: str, last_name: str, dob: str) -> Optional[Dict]:
+        """In-memory equivalent of the $or query in _exact_match"""
+        if ssn_hash and ssn_hash in self.by_ssn_hash:
+            return self.by_ssn_hash[ssn_hash]
+
+        if first_name and last_name and dob:
+            for doc in self.by_demographics.get((first_name, last_name, dob), ()):
+                if not ssn_hash or doc.get('ssn_hash') in (ssn_hash, ''):
+                    return doc
+
+        return None
+
+    def fuzzy_candidates(self, last_soundex: str, dob_variations: Optional[List[str]]) -> Optional[List[Dict]]:
+        """In-memory equivalent of the candidate query in _fuzzy_match
+
+        Returns None for records without a DOB: whole soundex buckets are not
+        prefetched, so those records query MongoDB themselves.
+        """
+        if dob_variations is None:
+            return None
+        allowed = set(dob_variations)
+        docs = [doc for doc in self.by_soundex.get(last_soundex, ()) if doc.get('dob') in allowed]
+        return docs[:_MAX_FUZZY_CANDIDATES]
+
+
+# Set by batch_process: exact and fuzzy lookups resolve against one prefetch
+_batch_candidates: ContextVar[Optional[_BatchCandidates]] = ContextVar('internal_batch_candidates', default=None)
+
+# Exact-match bloom filter: one Redis bitmap shared by every worker. Bit 0 is
+# set once the filter holds the whole collection, so a missing or evicted
+# bitmap reads as "not built" and lookups fall through to MongoDB
+_BLOOM_HASHES = 7
+_BLOOM_BUILD_CHUNK = 10_000
+_BLOOM_PROJECTION = {'_id': 0, 'ssn_hash': 1, 'first_name': 1, 'last_name': 1, 'dob': 1}
 
-@dataclass
+
+def _exact_keys(ssn_hash: Optional[str], first_name: str, last_name: str, dob: str) -> List[str]:
+    """Bloom keys for the two clauses of _exact_match"""
+    keys = []
+    if ssn_hash:
+        keys.append(f"S{ssn_hash}")
+    if first_name and last_name and dob:
+        keys.append(f"D{first_name}\x1f{last_name}\x1f{dob}")
+    return keys
+
+
+def _bloom_offsets(key: str, bits: int) -> List[int]:
+    """Bit positions of a key (bit 0 is reserved for the built flag)"""
+    digest = _blake2b(key.encode(), digest_size=4 * _BLOOM_HASHES, usedforsecurity=False).digest()
+    return [1 + int.from_bytes(digest[i:i + 4], 'little') % bits for i in range(0, len(digest), 4)]
+
+
+# Set by batch_process: new patients are collected for one insert_many
+_batch_inserts: ContextVar[Optional[list]] = ContextVar('internal_batch_inserts', default=None)
+
+
+def _normalize_value(value: Any) -> str:
+    """Lowercased, stripped string form used for field comparison"""
+    return str(value).strip().lower()
+
+
+def _candidate_value(candidate: Dict[str, Any], field: str) -> str:
+    """Normalized candidate field, preferring the stored *_norm copy"""
+    norm_field = _NORM_FIELDS.get(field)
+    if norm_field is not None:
+        value = candidate.get(norm_field)
+        if value is not None:
+            return value
+    # Documents written before *_norm fields existed
+    return _normalize_value(candidate.get(field, ''))
+
+
+# Common data entry formats of an ISO date, incl. international order and 2-digit years
+_DOB_VARIATION_FORMATS = ('%m/%d/%Y', '%m-%d-%Y', '%Y/%m/%d', '%d/%m/%Y', '%m/%d/%y', '%m-%d-%y')
+
+
+@lru_cache(maxsize=4096)
+def _dob_variations(dob: str) -> tuple:
+    """DOB variations for one date string, parsed once per distinct DOB"""
+    try:
+        parsed_date = datetime.strptime(dob, '%Y-%m-%d')
+    except ValueError:
+        # If parsing fails, just return original
+        return (dob,)
+
+    variations = [dob]
+    variations.extend(parsed_date.strftime(fmt) for fmt in _DOB_VARIATION_FORMATS)
+    return tuple(dict.fromkeys(variations))  # Remove duplicates
+
+
+@dataclass(slots=True)
 class InternalProviderConfig(ProviderConfig):
     """Configuration for Internal MPI Provider"""
 
@@ -35,6 +266,7 @@ class InternalProviderConfig(ProviderConfig):
     mongo_uri: str = os.getenv('MONGODB_URI', 'mongodb://localhost:27017')
     mongo_db: str = os.getenv('MPI_DB', 'mpi_service')
     mongo_collection: str = os.getenv('INTERNAL_MPI_COLLECTION', 'internal_mpi')
+    mongo_max_pool_size: int = int(os.getenv('INTERNAL_MPI_MONGO_POOL_SIZE', '100'))
 
     # Redis settings
     redis_host: str = os.getenv('REDIS_HOST', 'localhost')
@@ -49,9 +281,12 @@ class InternalProviderConfig(ProviderConfig):
     # Performance settings
     enable_ml_matching: bool = os.getenv('FEATURE_ML_MATCHING', 'false').lower() == 'true'
     cache_enabled: bool = True
+    exact_bloom_enabled: bool = os.getenv('INTERNAL_EXACT_BLOOM', 'true').lower() == 'true'
+    exact_bloom_bits: int = int(os.getenv('INTERNAL_EXACT_BLOOM_BITS', str(2 ** 27)))  # 16 MB bitmap
 
     def __post_init__(self):
-        super().__post_init__()
+        # Explicit base call - zero-arg super() breaks in slots=True dataclasses
+        ProviderConfig.__post_init__(self)
 
         if self.exact_match_fields is None:
             self.exact_match_fields = ['ssn']
@@ -89,6 +324,10 @@ class InternalMPIProvider(BaseMPIProvider):
         self.collection = None
         self.redis_client = None
 
+        # Exact-match bloom filter, built in the background on first start
+        self._bloom_key = f"internal_mpi:exact_bloom:{self.config.mongo_collection}"
+        self._bloom_task = None
+
         # Statistics
         self.exact_matches = 0
         self.fuzzy_matches = 0
@@ -105,7 +344,7 @@ class InternalMPIProvider(BaseMPIProvider):
                 self.redis_client = self.mpi_service.redis_client
             else:
                 # Create our own connections
-                self.mongo_client = MongoClient(self.config.mongo_uri)
+                self.mongo_client = AsyncIOMotorClient(self.config.mongo_uri, maxPoolSize=self.config.mongo_max_pool_size)
                 self.db = self.mongo_client[self.config.mongo_db]
 
                 # Redis connection
@@ -113,7 +352,8 @@ class InternalMPIProvider(BaseMPIProvider):
                     host=self.config.redis_host,
                     port=self.config.redis_port,
                     db=self.config.redis_db,
-                    decode_responses=True
+                    # Cache values are orjson bytes; skip the str decode
+                    decode_responses=False
                 )
 
             # Set up our collection
@@ -122,6 +362,12 @@ class InternalMPIProvider(BaseMPIProvider):
             # Create optimized indexes
             await self._create_indexes()
 
+            # Compile (or load the cached) Soundex kernel before the first request
+            self._soundex('WARMUP')
+
+            if self.config.exact_bloom_enabled and self.redis_client is not None:
+                self._bloom_task = asyncio.create_task(self._build_exact_bloom())
+
             self._initialized = True
             logger.info("Internal MPI Provider initialized successfully")
 
@@ -133,26 +379,25 @@ class InternalMPIProvider(BaseMPIProvider):
         """Create MongoDB indexes for optimal performance"""
         try:
             # Exact match indexes
-            await asyncio.get_event_loop().run_in_executor(
-                None, self.collection.create_index, 'ssn_hash'
+            # Compound indexes carry the projected fields of _exact_match so
+            # its lookups are answered from the index alone
+            await self.collection.create_index(
+                [('ssn_hash', 1), ('internal_mpi_id', 1), ('confidence_score', 1)]
             )
-            await asyncio.get_event_loop().run_in_executor(
-                None, self.collection.create_index, 'internal_mpi_id'
+            await self.collection.create_index('internal_mpi_id')
+            await self.collection.create_index(
+                [('last_name', 1), ('first_name', 1), ('dob', 1), ('ssn_hash', 1),
+                 ('internal_mpi_id', 1), ('confidence_score', 1)]
             )
 
             # Fuzzy match indexes
-            await asyncio.get_event_loop().run_in_executor(
-                None, self.collection.create_index,
+            await self.collection.create_index(
                 [('last_name_soundex', 1), ('first_name_soundex', 1), ('dob', 1)]
             )
 
             # Performance indexes
-            await asyncio.get_event_loop().run_in_executor(
-                None, self.collection.create_index, 'created_at'
-            )
-            await asyncio.get_event_loop().run_in_executor(
-                None, self.collection.create_index, 'confidence_score'
-            )
+            await self.collection.create_index('created_at')
+            await self.collection.create_index('confidence_score')
 
         except Exception as e:
             logger.warning(f"Could not create indexes: {e}")
@@ -168,15 +413,15 @@ class InternalMPIProvider(BaseMPIProvider):
         4. Generate new internal MPI ID if no match
         """
         self.total_queries += 1
-        start_time = datetime.utcnow()
+        start_ns = perf_counter_ns()
 
         try:
             # Validate and standardize input
             self._validate_patient_data(patient_data)
             standardized_data = self._standardize_patient_data(patient_data)
 
-            # Check cache first
-            if self.config.cache_enabled:
+            # Check cache first (batch_process has already done it)
+            if self.config.cache_enabled and _batch_cache_writes.get() is None:
                 cached_result = await self._get_cached_result(standardized_data)
                 if cached_result:
                     return cached_result
@@ -193,7 +438,7 @@ class InternalMPIProvider(BaseMPIProvider):
                     metadata={
                         'match_type': 'exact',
                         'matched_field': exact_match.get('matched_field', 'ssn'),
-                        'processing_time_ms': (datetime.utcnow() - start_time).total_seconds() * 1000
+                        'processing_time_ms': (perf_counter_ns() - start_ns) / 1_000_000
                     }
                 )
                 await self._cache_result(standardized_data, result)
@@ -211,7 +456,7 @@ class InternalMPIProvider(BaseMPIProvider):
                     metadata={
                         'match_type': 'fuzzy',
                         'matched_fields': fuzzy_match.get('matched_fields', []),
-                        'processing_time_ms': (datetime.utcnow() - start_time).total_seconds() * 1000
+                        'processing_time_ms': (perf_counter_ns() - start_ns) / 1_000_000
                     }
                 )
                 await self._cache_result(standardized_data, result)
@@ -231,7 +476,7 @@ class InternalMPIProvider(BaseMPIProvider):
                 source='new_patient',
                 metadata={
                     'match_type': 'new',
-                    'processing_time_ms': (datetime.utcnow() - start_time).total_seconds() * 1000
+                    'processing_time_ms': (perf_counter_ns() - start_ns) / 1_000_000
                 }
             )
 
@@ -247,7 +492,7 @@ class InternalMPIProvider(BaseMPIProvider):
                 source='error',
                 error=str(e),
                 metadata={
-                    'processing_time_ms': (datetime.utcnow() - start_time).total_seconds() * 1000
+                    'processing_time_ms': (perf_counter_ns() - start_ns) / 1_000_000
                 }
             )
 
@@ -258,8 +503,7 @@ class InternalMPIProvider(BaseMPIProvider):
             cached = await self.redis_client.get(cache_key)
 
             if cached:
-                import json
-                data = json.loads(cached)
+                data = orjson.loads(cached)
                 return MPIResult(**data)
 
         except Exception as e:
@@ -274,49 +518,108 @@ class InternalMPIProvider(BaseMPIProvider):
                 return
 
             cache_key = self._build_cache_key(patient_data)
-            import json
 
-            # Convert result to dict for caching
-            result_dict = result.to_dict()
+            batch_writes = _batch_cache_writes.get()
+            if batch_writes is not None:
+                batch_writes.append((cache_key, result.to_json()))
+                return
 
             await self.redis_client.setex(
                 cache_key,
                 self.config.cache_ttl_seconds,
-                json.dumps(result_dict)
+                result.to_json()
             )
 
         except Exception as e:
             logger.warning(f"Cache storage error: {e}")
 
+    async def _mget_cached(self, cache_keys: List[str]) -> Dict[str, MPIResult]:
+        """Pipelined GET of many cache keys; returns only the hits"""
+        if not cache_keys:
+            return {}
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for cache_key in cache_keys:
+                pipe.get(cache_key)
+            values = await pipe.execute()
+
+            return {
+                cache_key: MPIResult(**orjson.loads(value))
+                for cache_key, value in zip(cache_keys, values) if value
+            }
+
+        except Exception as e:
+            logger.warning(f"Cache batch retrieval error: {e}")
+            return {}
+
+    async def _mset_cached(self, entries: List[tuple]):
+        """Pipelined SETEX of (cache_key, payload) pairs"""
+        if not entries:
+            return
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for cache_key, payload in entries:
+                pipe.setex(cache_key, self.config.cache_ttl_seconds, payload)
+            await pipe.execute()
+
+        except Exception as e:
+            logger.warning(f"Cache batch storage error: {e}")
+
     def _build_cache_key(self, patient_data: Dict[str, Any]) -> str:
         """Build cache key from patient data"""
-        key_fields = {
-            'ssn': patient_data.get('ssn', ''),
-            'first_name': patient_data.get('first_name', '').lower(),
-            'last_name': patient_data.get('last_name', '').lower(),
-            'dob': patient_data.get('dob', '')
-        }
-
-        import json
-        key_string = json.dumps(key_fields, sort_keys=True)
-        key_hash = hashlib.blake2b(key_string.encode(), digest_size=16).hexdigest()
+        # Fixed field order joined on the ASCII unit separator - no JSON needed
+        key_string = '\x1f'.join((
+            patient_data.get('ssn', ''),
+            patient_data.get('first_name', '').lower(),
+            patient_data.get('last_name', '').lower(),
+            patient_data.get('dob', '')
+        ))
+        key_hash = _blake2b(key_string.encode(), digest_size=16, usedforsecurity=False).hexdigest()
         return f"internal_mpi:{key_hash}"
 
     async def _exact_match(self, patient_data: Dict[str, Any]) -> Optional[Dict]:
         """Try exact matching on key fields"""
 
-        # SSN exact match (highest priority)
+        # SSN and exact demographics are probed in one $or query so a
+        # miss costs a single round trip
+        clauses = []
+
         ssn = patient_data.get('ssn')
-        if ssn:
-            ssn_hash = self._hash_ssn(ssn)
-            result = await asyncio.get_event_loop().run_in_executor(
-                None, self.collection.find_one, {'ssn_hash': ssn_hash}
+        ssn_hash = self._hash_ssn(ssn) if ssn else None
+        if ssn_hash:
+            clauses.append({'ssn_hash': ssn_hash})
+
+        first_name = patient_data.get('first_name')
+        last_name = patient_data.get('last_name')
+        dob = patient_data.get('dob')
+        if first_name and last_name and dob:
+            demographics = {'first_name': first_name, 'last_name': last_name, 'dob': dob}
+            if ssn_hash:
+                # Never treat a record with a different SSN as an exact match
+                demographics['ssn_hash'] = {'$in': [ssn_hash, '']}
+            clauses.append(demographics)
+
+        if not clauses:
+            return None
+
+        prefetched = _batch_candidates.get()
+        if prefetched is not None:
+            doc = prefetched.exact_match(ssn_hash, first_name, last_name, dob)
+            result = {field: doc[field] for field in _EXACT_MATCH_FIELDS if field in doc} if doc else None
+        elif not await self._bloom_might_contain(_exact_keys(ssn_hash, first_name, last_name, dob)):
+            # Neither this SSN nor these demographics were ever stored
+            return None
+        else:
+            result = await self.collection.find_one(
+                {'$or': clauses},
+                {'_id': 0, 'internal_mpi_id': 1, 'confidence_score': 1, 'ssn_hash': 1}
             )
-            if result:
-                result['matched_field'] = 'ssn'
-                return result
+        if result:
+            result['matched_field'] = 'ssn' if ssn_hash and result.get('ssn_hash') == ssn_hash else 'demographics'
+            return result
 
-        # Add other exact match strategies here if needed
         return None
 
     async def _fuzzy_match(self, patient_data: Dict[str, Any]) -> Optional[Dict]:
@@ -339,21 +642,40 @@ class InternalMPIProvider(BaseMPIProvider):
             # Allow slight DOB variations (common data entry errors)
             query['dob'] = {'$in': self._get_dob_variations(dob)}
 
-        candidates = await asyncio.get_event_loop().run_in_executor(
-            None, lambda: list(self.collection.find(query).limit(100))
-        )
+        prefetched = _batch_candidates.get()
+        candidates = None
+        if prefetched is not None:
+            candidates = prefetched.fuzzy_candidates(last_soundex, query['dob']['$in'] if dob else None)
+        if candidates is None:
+            candidates = await self.collection.find(query, _CANDIDATE_PROJECTION).limit(
+                _MAX_FUZZY_CANDIDATES
+            ).to_list(_MAX_FUZZY_CANDIDATES)
 
         best_match = None
         best_score = 0.0
         best_matched_fields = []
 
-        for candidate in candidates:
-            score, matched_fields = self._calculate_match_score(patient_data, candidate)
-
+        if rprocess is not None and candidates:
+            index, score, matched_fields = self._score_candidates(patient_data, candidates)
             if score > best_score and score >= self.config.fuzzy_threshold:
                 best_score = score
-                best_match = candidate
+                best_match = candidates[index]
                 best_matched_fields = matched_fields
+        else:
+            # Slow path: per-candidate fuzzywuzzy scoring
+            plan = self._score_plan(patient_data)
+            for candidate in candidates:
+                score, matched_fields = self._calculate_match_score(patient_data, candidate, plan)
+
+                if score > best_score and score >= self.config.fuzzy_threshold:
+                    best_score = score
+                    best_match = candidate
+                    best_matched_fields = matched_fields
+
+                    # Nothing can beat a perfect score (ties keep the earlier
+                    # candidate), so the rest need not be scored
+                    if best_score >= 100.0:
+                        break
 
         if best_match:
             # Convert score to confidence (0-1 range)
@@ -367,31 +689,104 @@ class InternalMPIProvider(BaseMPIProvider):
 
         return None
 
-    def _calculate_match_score(self, patient_data: Dict, candidate: Dict) -> tuple:
+    def _score_candidates(self, patient_data: Dict, candidates: List[Dict]) -> tuple:
+        """
+        Vectorized _calculate_match_score over all candidates.
+
+        Returns (index, score, matched_fields) of the best-scoring candidate.
+        """
+        n = len(candidates)
+        fields = []
+        columns = []
+
+        for field in self.config.probabilistic_weights:
+            patient_value = str(patient_data.get(field, '')).strip().lower()
+            if not patient_value:
+                continue
+
+            candidate_values = [_candidate_value(candidate, field) for candidate in candidates]
+
+            if field in _EXACT_SCORE_FIELDS:
+                similarity = np.fromiter(
+                    (100.0 if value == patient_value else 0.0 for value in candidate_values),
+                    dtype=float, count=n
+                )
+            elif field in _NAME_SCORE_FIELDS:
+                # fuzzywuzzy scorers return rounded ints - round the same way so
+                # scores near the field cutoff and fuzzy_threshold agree
+                similarity = np.rint(rprocess.cdist([patient_value], candidate_values, scorer=rfuzz.ratio, workers=-1)[0])
+            else:
+                # Token-set scoring tolerates reordered/abbreviated parts
+                # ("123 main st apt 4" vs "123 main street #4"); the cutoff
+                # zeroes scores that could not count anyway
+                similarity = np.rint(rprocess.cdist(
+                    [patient_value], candidate_values, scorer=rfuzz.token_set_ratio,
+                    processor=rutils.default_process, score_cutoff=_MIN_FIELD_SIMILARITY, workers=-1
+                )[0])
+
+            fields.append(field)
+            columns.append(similarity)
+
+        if not fields:
+            return 0, 0.0, []
+
+        # (candidates x fields) similarity matrix; the weighted sums are two
+        # matrix-vector products. Empty candidate values score 0, so the mask
+        # also skips missing fields.
+        sims = np.column_stack(columns).astype(np.float64, copy=False)
+        weights = np.array([self.config.probabilistic_weights[field] for field in fields], dtype=float)
+        counted = sims > _MIN_FIELD_SIMILARITY
+        total_score = (sims * counted) @ weights
+        total_weight = counted @ weights
+
+        scores = np.divide(total_score, total_weight, out=np.zeros(n), where=total_weight > 0)
+        best = int(np.argmax(scores))
+        matched_fields = [field for field, hit in zip(fields, counted[best]) if hit]
+
+        return best, float(scores[best]), matched_fields
+
+    def _score_plan(self, patient_data: Dict) -> List[tuple]:
+        """
+        (field, weight, scorer, patient_value) for each field the patient has.
+
+        Built once per query so the per-candidate loop neither re-normalizes
+        the patient's values nor re-picks scorers. A None scorer means exact match.
+        """
+        plan = []
+        for field, weight in self.config.probabilistic_weights.items():
+            patient_value = str(patient_data.get(field, '')).strip().lower()
+            if not patient_value:
+                continue
+
+            if field in _NAME_SCORE_FIELDS:
+                # Use fuzzy string matching for names
+                scorer = fuzz.ratio
+            elif field in _EXACT_SCORE_FIELDS:
+                # Exact match for dates (variations handled in query) and SSN
+                scorer = None
+            else:
+                # Token-set match for other fields (addresses, phones)
+                scorer = fuzz.token_set_ratio
+
+            plan.append((field, weight, scorer, patient_value))
+        return plan
+
+    def _calculate_match_score(self, patient_data: Dict, candidate: Dict, plan: List[tuple] = None) -> tuple:
         """Calculate weighted similarity score between patient data and candidate"""
         total_score = 0.0
         total_weight = 0.0
         matched_fields = []
 
-        for field, weight in self.config.probabilistic_weights.items():
-            patient_value = str(patient_data.get(field, '')).strip().lower()
-            candidate_value = str(candidate.get(field, '')).strip().lower()
-
-            if patient_value and candidate_value:
-                if field in ['first_name', 'last_name']:
-                    # Use fuzzy string matching for names
-                    similarity = fuzz.ratio(patient_value, candidate_value)
-                elif field == 'dob':
-                    # Exact match for dates (already handled variations in query)
-                    similarity = 100.0 if patient_value == candidate_value else 0.0
-                elif field == 'ssn':
-                    # Exact match for SSN
+        for field, weight, scorer, patient_value in plan or self._score_plan(patient_data):
+            candidate_value = _candidate_value(candidate, field)
+
+            if candidate_value:
+                if scorer is None:
                     similarity = 100.0 if patient_value == candidate_value else 0.0
                 else:
-                    # Fuzzy match for other fields
-                    similarity = fuzz.partial_ratio(patient_value, candidate_value)
+                    similarity = scorer(patient_value, candidate_value)
 
-                if similarity > 70:  # Only count reasonably good matches
+                if similarity > _MIN_FIELD_SIMILARITY:  # Only count reasonably good matches
                     total_score += similarity * weight
                     total_weight += weight
                     matched_fields.append(field)
@@ -407,17 +802,27 @@ class InternalMPIProvider(BaseMPIProvider):
     def _generate_internal_mpi_id(self) -> str:
         """Generate a new internal MPI ID"""
         # Use prefix to distinguish from external provider IDs
-        return f"INT-{uuid.uuid4().hex[:12].upper()}"
+        # 48 random bits, same as the first 12 hex digits of a uuid4
+        return f"INT-{os.urandom(6).hex().upper()}"
 
     async def _store_new_patient(self, patient_data: Dict[str, Any], mpi_id: str):
         """Store new patient record in database"""
+        first_name = patient_data.get('first_name', '')
+        last_name = patient_data.get('last_name', '')
+        last_name_norm = _normalize_value(last_name)
+        now = datetime.utcnow()
+
         document = {
             'internal_mpi_id': mpi_id,
             'ssn_hash': self._hash_ssn(patient_data.get('ssn', '')),
-            'first_name': patient_data.get('first_name', ''),
-            'last_name': patient_data.get('last_name', ''),
-            'first_name_soundex': self._soundex(patient_data.get('first_name', '')),
-            'last_name_soundex': self._soundex(patient_data.get('last_name', '')),
+            'first_name': first_name,
+            'last_name': last_name,
+            # Normalized once here so fuzzy scoring doesn't redo it per candidate
+            'first_name_norm': _normalize_value(first_name),
+            'last_name_norm': last_name_norm,
+            'name_tokens_sorted': ' '.join(sorted(last_name_norm.split())),
+            'first_name_soundex': self._soundex(first_name),
+            'last_name_soundex': self._soundex(last_name),
             'dob': patient_data.get('dob', ''),
             'gender': patient_data.get('gender', ''),
             'address_1': patient_data.get('address_1', ''),
@@ -427,14 +832,21 @@ class InternalMPIProvider(BaseMPIProvider):
             'home_phone': patient_data.get('home_phone', ''),
             'email': patient_data.get('email', ''),
             'confidence_score': 1.0,
-            'created_at': datetime.utcnow(),
-            'updated_at': datetime.utcnow()
+            'created_at': now,
+            'updated_at': now
         }
 
+        # In a batch the prefetched index makes this patient visible to later
+        # records, so the write itself can wait for the batch flush
+        batch_inserts = _batch_inserts.get()
+        if batch_inserts is not None:
+            batch_inserts.append(document)
+            _batch_candidates.get().add(document)
+            return
+
         try:
-            await asyncio.get_event_loop().run_in_executor(
-                None, self.collection.insert_one, document
-            )
+            await self._bloom_add([document])
+            await self.collection.insert_one(document)
             logger.info(f"Stored new patient with Internal MPI ID: {mpi_id}")
         except Exception as e:
             logger.error(f"Failed to store new patient: {e}")
@@ -444,95 +856,250 @@ class InternalMPIProvider(BaseMPIProvider):
         if not ssn:
             return ''
         clean_ssn = ''.join(filter(str.isdigit, ssn))
-        return hashlib.sha256(clean_ssn.encode()).hexdigest()[:16]
+        return _sha256(clean_ssn.encode()).hexdigest()[:16]
 
     def _soundex(self, word: str) -> str:
         """Simple Soundex implementation for phonetic matching"""
-        if not word:
-            return ''
+        return _soundex_code(word)
 
-        word = word.upper()
-        soundex_map = {
-            'BFPV': '1', 'CGJKQSXZ': '2', 'DT': '3', 'L': '4', 'MN': '5', 'R': '6'
-        }
+    def _get_dob_variations(self, dob: str) -> List[str]:
+        """Get DOB variations to account for common data entry errors"""
+        return list(_dob_variations(dob))
 
-        # Keep first letter
-        result = word[0]
+    async def batch_process(self, patient_records: List[Dict[str, Any]],
+                          max_concurrent: int = 40) -> List[MPIResult]:
+        """
+        Optimized batch processing for internal provider
+        """
+        results: List[Optional[MPIResult]] = [None] * len(patient_records)
+        todo = list(enumerate(patient_records))
+        cache_writes = None
+
+        standardized = {}
+        for i, patient_data in todo:
+            try:
+                self._validate_patient_data(patient_data)
+                standardized[i] = self._standardize_patient_data(patient_data)
+            except Exception:
+                continue  # get_mpi_id reports the validation error
+
+        if self.config.cache_enabled and self.redis_client is not None:
+            # One pipelined GET for the whole batch instead of a GET per record
+            keyed = [(i, self._build_cache_key(standardized_data)) for i, standardized_data in standardized.items()]
+
+            hits = await self._mget_cached([cache_key for _, cache_key in keyed])
+            for i, cache_key in keyed:
+                hit = hits.get(cache_key)
+                if hit:
+                    self.total_queries += 1
+                    results[i] = hit
+
+            todo = [(i, patient_data) for i, patient_data in todo if results[i] is None]
+            cache_writes = []
+
+        # Two Mongo queries for the whole batch instead of two per record
+        candidates = await self._prefetch_candidates([standardized[i] for i, _ in todo if i in standardized])
+
+        # Bounded worker pool: max_concurrent workers share one iterator, so
+        # large batches never materialize a coroutine per record
+        pending = iter(todo)
+
+        async def worker():
+            for i, patient_data in pending:
+                try:
+                    results[i] = await self.get_mpi_id(patient_data)
+                except Exception as e:
+                    logger.error(f"Batch processing error for record {i}: {e}")
+                    results[i] = MPIResult(
+                        mpi_id=None,
+                        confidence=0.0,
+                        provider='internal',
+                        source='batch_error',
+                        error=str(e)
+                    )
+
+        # New patients are only deferred when the prefetch index can serve them
+        inserts = [] if candidates is not None else None
+
+        token = _batch_cache_writes.set(cache_writes)
+        candidates_token = _batch_candidates.set(candidates)
+        inserts_token = _batch_inserts.set(inserts)
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(max_concurrent, len(todo)))))
+        finally:
+            _batch_inserts.reset(inserts_token)
+            _batch_candidates.reset(candidates_token)
+            _batch_cache_writes.reset(token)
 
-        # Replace consonants with digits
-        for char in word[1:]:
-            for key, value in soundex_map.items():
-                if char in key:
-                    if result[-1] != value:  # Avoid consecutive duplicates
-                        result += value
-                    break
-            else:
-                if char in 'AEIOUY':
-                    result += '0'
+        # One unordered insert_many for every new patient, before the cache
+        # starts pointing at their IDs
+        if inserts:
+            await self._insert_new_patients(inserts)
 
-        # Remove zeros and pad/truncate to 4 characters
-        result = result.replace('0', '')
-        return (result + '000')[:4]
+        # One pipelined SETEX for everything the workers resolved
+        if cache_writes:
+            await self._mset_cached(cache_writes)
 
-    def _get_dob_variations(self, dob: str) -> List[str]:
-        """Get DOB variations to account for common data entry errors"""
-        variations = [dob]
+        return results
+
+    async def _bloom_might_contain(self, keys: List[str]) -> bool:
+        """False only when the bloom filter proves no exact match can exist"""
+        if not keys or not self.config.exact_bloom_enabled or self.redis_client is None:
+            return True
 
         try:
-            # Parse date and create variations
-            from datetime import datetime
-            parsed_date = datetime.strptime(dob, '%Y-%m-%d')
-
-            # Common format variations
-            variations.extend([
-                parsed_date.strftime('%m/%d/%Y'),
-                parsed_date.strftime('%m-%d-%Y'),
-                parsed_date.strftime('%Y/%m/%d'),
-                parsed_date.strftime('%d/%m/%Y'),  # International format
-            ])
-
-            # Year variations (2-digit vs 4-digit years)
-            variations.extend([
-                parsed_date.strftime('%m/%d/%y'),
-                parsed_date.strftime('%m-%d-%y'),
-            ])
-
-        except ValueError:
-            # If parsing fails, just return original
-            pass
-
-        return list(set(variations))  # Remove duplicates
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.getbit(self._bloom_key, 0)
+            for key in keys:
+                for offset in _bloom_offsets(key, self.config.exact_bloom_bits):
+                    pipe.getbit(self._bloom_key, offset)
+            bits = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Bloom filter lookup error: {e}")
+            return True
 
-    async def batch_process(self, patient_records: List[Dict[str, Any]],
-                          max_concurrent: int = 40) -> List[MPIResult]:
+        if not bits[0]:
+            return True  # Not built yet (or evicted)
+
+        return any(
+            all(bits[start:start + _BLOOM_HASHES])
+            for start in range(1, len(bits), _BLOOM_HASHES)
+        )
+
+    async def _bloom_add(self, documents: List[Dict[str, Any]], strict: bool = False):
+        """Set the bloom bits for stored patient documents"""
+        if not self.config.exact_bloom_enabled or self.redis_client is None:
+            return
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for doc in documents:
+                keys = _exact_keys(doc.get('ssn_hash'), doc.get('first_name'), doc.get('last_name'), doc.get('dob'))
+                for key in keys:
+                    for offset in _bloom_offsets(key, self.config.exact_bloom_bits):
+                        pipe.setbit(self._bloom_key, offset, 1)
+            await pipe.execute()
+        except Exception as e:
+            if strict:
+                raise
+            # A patient missing from the filter would be rejected as unseen,
+            # so stop trusting the filter until it is rebuilt
+            logger.error(f"Bloom filter update error: {e}")
+            try:
+                await self.redis_client.setbit(self._bloom_key, 0, 0)
+            except Exception:
+                pass
+
+    async def _build_exact_bloom(self):
+        """Load every stored patient into the bloom filter (once, by one worker)"""
+        try:
+            if await self.redis_client.getbit(self._bloom_key, 0):
+                return
+
+            # Another worker may already be building it
+            if not await self.redis_client.set(f"{self._bloom_key}:build", 1, nx=True, ex=600):
+                return
+
+            chunk = []
+            async for doc in self.collection.find({}, _BLOOM_PROJECTION):
+                chunk.append(doc)
+                if len(chunk) >= _BLOOM_BUILD_CHUNK:
+                    await self._bloom_add(chunk, strict=True)
+                    chunk = []
+            await self._bloom_add(chunk, strict=True)
+
+            # Patients stored meanwhile set their own bits before inserting
+            await self.redis_client.setbit(self._bloom_key, 0, 1)
+            logger.info("Exact-match bloom filter built")
+
+        except Exception as e:
+            logger.warning(f"Could not build exact-match bloom filter: {e}")
+
+    async def _insert_new_patients(self, documents: List[Dict[str, Any]]):
+        """Store the new patients of a batch with one insert_many"""
+        try:
+            await self._bloom_add(documents)
+            await self.collection.insert_many(documents, ordered=False)
+            logger.info(f"Stored {len(documents)} new patients from batch")
+        except Exception as e:
+            logger.error(f"Failed to store new patients from batch: {e}")
+
+    async def _prefetch_candidates(self, records: List[Dict[str, Any]]) -> Optional[_BatchCandidates]:
         """
-        Optimized batch processing for internal provider
+        Fetch exact-match and fuzzy candidates for a whole batch.
+
+        Issues one $or query per match stage (run concurrently) over the union
+        of the batch's keys; each record is then matched in memory. Records
+        without a DOB are left to per-record fuzzy queries. Returns None on
+        failure, or when a query exceeds _MAX_BATCH_PREFETCH_DOCS, so records
+        fall back to per-record queries.
         """
-        semaphore = asyncio.Semaphore(max_concurrent)
-
-        async def process_with_limit(patient_data):
-            async with semaphore:
-                return await self.get_mpi_id(patient_data)
-
-        tasks = [process_with_limit(patient) for patient in patient_records]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Handle any exceptions
-        processed_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error(f"Batch processing error for record {i}: {result}")
-                processed_results.append(MPIResult(
-                    mpi_id=None,
-                    confidence=0.0,
-                    provider='internal',
-                    source='batch_error',
-                    error=str(result)
-                ))
-            else:
-                processed_results.append(result)
+        if not records or self.collection is None:
+            return None
 
-        return processed_results
+        ssn_hashes, first_names, last_names, dobs = set(), set(), set(), set()
+        dated_soundex, dob_variations = set(), set()
+
+        for patient_data in records:
+            ssn = patient_data.get('ssn')
+            if ssn:
+                ssn_hashes.add(self._hash_ssn(ssn))
+
+            first_name = patient_data.get('first_name')
+            last_name = patient_data.get('last_name')
+            dob = patient_data.get('dob')
+            if first_name and last_name and dob:
+                first_names.add(first_name)
+                last_names.add(last_name)
+                dobs.add(dob)
+
+            first_name = (first_name or '').strip()
+            last_name = (last_name or '').strip()
+            # Records without a DOB would pull whole soundex buckets - they
+            # keep the per-record (limited) candidate query instead
+            if first_name and last_name and dob:
+                dated_soundex.add(self._soundex(last_name))
+                dob_variations.update(self._get_dob_variations(dob))
+
+        exact_clauses = []
+        if ssn_hashes:
+            exact_clauses.append({'ssn_hash': {'$in': list(ssn_hashes)}})
+        if dobs:
+            exact_clauses.append({
+                'first_name': {'$in': list(first_names)},
+                'last_name': {'$in': list(last_names)},
+                'dob': {'$in': list(dobs)}
+            })
+
+        fuzzy_clauses = []
+        if dated_soundex:
+            fuzzy_clauses.append({'last_name_soundex': {'$in': list(dated_soundex)}, 'dob': {'$in': list(dob_variations)}})
+
+        async def fetch(clauses):
+            if not clauses:
+                return []
+            # One past the cap tells a full result apart from a truncated one
+            return await self.collection.find({'$or': clauses}, _BATCH_PROJECTION).limit(
+                _MAX_BATCH_PREFETCH_DOCS + 1
+            ).to_list(_MAX_BATCH_PREFETCH_DOCS + 1)
+
+        try:
+            exact_docs, fuzzy_docs = await asyncio.gather(fetch(exact_clauses), fetch(fuzzy_clauses))
+        except Exception as e:
+            logger.warning(f"Batch candidate prefetch error: {e}")
+            return None
+
+        if len(exact_docs) > _MAX_BATCH_PREFETCH_DOCS or len(fuzzy_docs) > _MAX_BATCH_PREFETCH_DOCS:
+            logger.info(f"Batch candidate prefetch exceeded {_MAX_BATCH_PREFETCH_DOCS} documents, using per-record queries")
+            return None
+
+        # Fuzzy docs first so each soundex bucket keeps the candidate query's order
+        candidates = _BatchCandidates()
+        for doc in fuzzy_docs:
+            candidates.add(doc)
+        for doc in exact_docs:
+            candidates.add(doc)
+        return candidates
 
     def get_stats(self) -> Dict[str, Any]:
         """Get provider statistics"""
@@ -559,9 +1126,12 @@ class InternalMPIProvider(BaseMPIProvider):
 
     async def cleanup(self) -> None:
         """Cleanup resources"""
+        if self._bloom_task and not self._bloom_task.done():
+            self._bloom_task.cancel()
+
         if self.redis_client and not self.mpi_service:
             # Only close if we own the connection
-            await self.redis_client.close()
+            await self.redis_client.aclose()
 
         if self.mongo_client and not self.mpi_service:
             # Only close if we own the connection
@@ -4,20 +4,91 @@ Designed to be pluggable and collect Verato IDs for ML training
 """
 
 import os
+import re
 import json
 import asyncio
+import random
 import hashlib
-from typing import Dict, Optional, Any
+import time
+import uuid
+from collections import deque
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 import aiohttp
-import redis
-from pymongo import MongoClient
+import orjson
+from cachetools import TTLCache
+import redis.asyncio as redis
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import IndexModel, UpdateOne
 from dataclasses import dataclass
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Placeholder values the upstream extracts use for missing fields
+_NOT_PROVIDED = frozenset({'nan', 'not-provided'})
+_PHONE_NOT_PROVIDED = _NOT_PROVIDED | {'not-included'}
+_NON_DIGITS = re.compile(r'\D')
+
+# Patient fields mapped into the Verato identity payload
+_EMAIL_FIELDS = ('work_email', 'home_email', 'other_email')
+_NAME_FIELDS = (('first_name', 'first'), ('middle_name', 'middle'), ('last_name', 'last'), ('suffix', 'suffix'))
+_PHONE_FIELDS = ('home_phone', 'work_phone', 'other_phone')
+
+# Upstream statuses worth retrying with backoff
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Circuit breaker: rolling window of attempt outcomes, and the minimum
+# number of samples before the failure ratio can open the circuit
+_CIRCUIT_WINDOW = 100
+_CIRCUIT_MIN_CALLS = 20
+
+# Result for records without enough demographics to match on
+_INSUFFICIENT_DATA = {'verato_id': None, 'error': 'insufficient data', 'source': 'insufficient_data'}
+
+# Response paths to the linkId, in precedence order
+_LINK_PATHS = (('entity', 'content', 'linkId'), ('content', 'linkId'), ('linkId',))
+
+
+def _extract_link_id(data: Dict) -> Optional[str]:
+    """Extract the Verato linkId (SnapLogic: $response.entity.content.linkId)"""
+    # The first top-level key present picks the path, as in the SnapLogic mapping
+    for path in _LINK_PATHS:
+        if path[0] in data:
+            value = data
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            return value
+    return None
+
+
+def _has_matchable_fields(patient_data: Dict) -> bool:
+    """True if the record has an SSN, name + DOB, or street address + ZIP"""
+    def present(field):
+        value = patient_data.get(field)
+        return bool(value) and value not in _NOT_PROVIDED
+
+    return (
+        present('ssn')
+        or (present('first_name') and present('last_name') and present('dob'))
+        or (present('address_1') and present('zip'))
+    )
+
+
+def _format_phone(digits: str) -> Optional[Dict[str, str]]:
+    """Split a 10-digit (or 1-prefixed 11-digit) US number into Verato fields"""
+    if len(digits) == 11 and digits[0] == '1':
+        digits = digits[1:]
+    elif len(digits) != 10:
+        return None
+    return {
+        'countryCode': '1',
+        'areaCode': digits[:3],
+        'number': digits[3:],
+        'extension': ''
+    }
+
 
 @dataclass
 class VeratoConfig:
@@ -27,6 +98,10 @@ class VeratoConfig:
     timeout: int = int(os.getenv('VERATO_TIMEOUT', '5000'))
     max_retries: int = int(os.getenv('VERATO_MAX_RETRIES', '3'))
     cache_ttl: int = int(os.getenv('VERATO_CACHE_TTL', '86400'))  # 24 hours
+    memory_cache_size: int = int(os.getenv('VERATO_MEMORY_CACHE_SIZE', '10000'))
+    memory_cache_ttl: int = int(os.getenv('VERATO_MEMORY_CACHE_TTL', '300'))
+    circuit_failure_ratio: float = float(os.getenv('VERATO_CIRCUIT_FAILURE_RATIO', '0.5'))
+    circuit_cooldown: float = float(os.getenv('VERATO_CIRCUIT_COOLDOWN', '30'))  # seconds
 
     # MongoDB settings
     mongo_uri: str = os.getenv('MONGODB_URI', 'mongodb://localhost:27017')
@@ -45,29 +120,47 @@ class VeratoModule:
     Handles patient matching via Verato API with caching and persistence
     """
 
-    def __init__(self, config: VeratoConfig = None):
+    def __init__(self, config: VeratoConfig = None, session: Optional[aiohttp.ClientSession] = None):
         self.config = config or VeratoConfig()
+        # Shared HTTP session owned by the caller; never closed here
+        self.session = session
+        # Pooled fallback session created on first use when none is shared
+        self._own_session: Optional[aiohttp.ClientSession] = None
+        self._session_lock = asyncio.Lock()
+        # Circuit breaker state (True = failed attempt)
+        self._recent_failures = deque(maxlen=_CIRCUIT_WINDOW)
+        self._circuit_open_until = 0.0
+        # L1 cache in front of Redis for keys this process resolved recently
+        self.memory_cache = TTLCache(maxsize=self.config.memory_cache_size, ttl=self.config.memory_cache_ttl)
+
+        # Request headers and endpoint are fixed for the module's lifetime
+        self._headers = {
+            'Content-Type': 'application/json',
+            'Accept': '*/*',
+            'Connection': 'keep-alive'
+        }
+        # Add authentication if using API key
+        if self.config.api_key:
+            self._headers['X-API-Key'] = self.config.api_key
+        # Use the actual Verato endpoint from SnapLogic
+        self._endpoint = self.config.endpoint or 'https://cust0161-dev.verato-connect.com/link-ws/svc/postIdentity'
         self._init_connections()
 
     def _init_connections(self):
         """Initialize database connections"""
         try:
-            # MongoDB connection
-            self.mongo_client = MongoClient(self.config.mongo_uri)
+            # MongoDB connection (asyncio client; indexes in create_indexes)
+            self.mongo_client = AsyncIOMotorClient(self.config.mongo_uri, maxPoolSize=64)
             self.db = self.mongo_client[self.config.mongo_db]
             self.collection = self.db[self.config.mongo_collection]
 
-            # Create indexes
-            self.collection.create_index('verato_id')
-            self.collection.create_index('ssn_hash')
-            self.collection.create_index('created_at')
-
-            # Redis connection
+            # Redis connection (asyncio client - connects lazily on first command)
             self.redis_client = redis.Redis(
                 host=self.config.redis_host,
                 port=self.config.redis_port,
                 db=self.config.redis_db,
-                decode_responses=True
+                decode_responses=False,  # bytes go straight to orjson
+                max_connections=64
             )
 
             logger.info("Database connections initialized successfully")
@@ -76,19 +169,38 @@ class VeratoModule:
             logger.error(f"Failed to initialize connections: {e}")
             raise
 
+    async def create_indexes(self):
+        """Create missing MongoDB indexes (call once after construction)"""
+        indexes = [
+            # Unique so the verato_id upserts resolve through a single index probe
+            IndexModel('verato_id', unique=True, background=True),
+            # Covers the ssn_hash lookup in get_mpi_id (no document fetch)
+            IndexModel([('ssn_hash', 1), ('verato_id', 1), ('confidence', 1)], background=True),
+            IndexModel('created_at', background=True)
+        ]
+        try:
+            existing = await self.collection.index_information()
+            missing = [index for index in indexes if index.document['name'] not in existing]
+            if missing:
+                await self.collection.create_indexes(missing)
+            if not existing.get('verato_id_1', {}).get('unique', True):
+                logger.warning("Verato index verato_id_1 exists without a unique constraint")
+        except Exception as e:
+            logger.warning(f"Could not create Verato indexes: {e}")
+
     def _hash_ssn(self, ssn: str) -> str:
         """Create a hash of SSN for cache key"""
         if not ssn:
             return None
         # Remove any formatting
-        clean_ssn = ''.join(filter(str.isdigit, ssn))
+        clean_ssn = _NON_DIGITS.sub('', ssn)
         return hashlib.sha256(clean_ssn.encode()).hexdigest()[:16]
 
-    def _build_cache_key(self, patient_data: Dict) -> Optional[str]:
-        """Build a cache key from patient data"""
+    def _build_cache_key(self, patient_data: Dict, ssn_hash: Optional[str] = None) -> Optional[str]:
+        """Build a cache key from patient data (reusing ssn_hash when given)"""
         ssn = patient_data.get('ssn', '').replace('-', '')
         if ssn:
-            return f"verato:ssn:{self._hash_ssn(ssn)}"
+            return f"verato:ssn:{ssn_hash or self._hash_ssn(ssn)}"
 
         # Fallback to name + DOB if no SSN
         first = patient_data.get('first_name', '').lower()
@@ -97,7 +209,7 @@ class VeratoModule:
 
         if first and last and dob:
             key_string = f"{first}:{last}:{dob}"
-            key_hash = hashlib.md5(key_string.encode()).hexdigest()[:16]
+            key_hash = hashlib.blake2b(key_string.encode(), digest_size=8, usedforsecurity=False).hexdigest()
             return f"verato:demo:{key_hash}"
 
         return None
@@ -113,18 +225,33 @@ class VeratoModule:
             Dict with verato_id, confidence, and metadata
         """
         try:
-            # 1. Check cache first
-            cache_key = self._build_cache_key(patient_data)
+            # Nothing Verato could match on - skip the cache, database and API
+            if not _has_matchable_fields(patient_data):
+                return dict(_INSUFFICIENT_DATA)
+
+            # SSN hashed once; it keys the cache, the lookup and the stored document
+            ssn_hash = self._hash_ssn(patient_data.get('ssn', ''))
+
+            # 1. Check cache first (L1 memory, then Redis)
+            cache_key = self._build_cache_key(patient_data, ssn_hash)
             if cache_key:
-                cached = self.redis_client.get(cache_key)
+                result = self.memory_cache.get(cache_key)
+                if result is not None:
+                    return result
+
+                cached = await self.redis_client.get(cache_key)
                 if cached:
                     logger.info(f"Cache hit for {cache_key}")
-                    return json.loads(cached)
+                    result = orjson.loads(cached)
+                    self.memory_cache[cache_key] = result
+                    return result
 
             # 2. Check MongoDB
-            ssn_hash = self._hash_ssn(patient_data.get('ssn', ''))
             if ssn_hash:
-                existing = self.collection.find_one({'ssn_hash': ssn_hash})
+                existing = await self.collection.find_one(
+                    {'ssn_hash': ssn_hash},
+                    {'_id': 0, 'verato_id': 1, 'confidence': 1}
+                )
                 if existing:
                     logger.info(f"MongoDB hit for SSN hash {ssn_hash}")
                     result = {
@@ -134,10 +261,11 @@ class VeratoModule:
                     }
                     # Update cache
                     if cache_key:
-                        self.redis_client.setex(
+                        self.memory_cache[cache_key] = result
+                        await self.redis_client.setex(
                             cache_key,
                             self.config.cache_ttl,
-                            json.dumps(result)
+                            orjson.dumps(result)
                         )
                     return result
 
@@ -145,14 +273,15 @@ class VeratoModule:
             result = await self._call_verato_api(patient_data)
 
             # 4. Store in MongoDB
-            self._store_result(patient_data, result)
+            await self._store_result(patient_data, result, ssn_hash)
 
-            # 5. Update cache
-            if cache_key:
-                self.redis_client.setex(
+            # 5. Update cache (errors such as an open circuit are not cached)
+            if cache_key and not result.get('error'):
+                self.memory_cache[cache_key] = result
+                await self.redis_client.setex(
                     cache_key,
                     self.config.cache_ttl,
-                    json.dumps(result)
+                    orjson.dumps(result)
                 )
 
             return result
@@ -171,192 +300,183 @@ class VeratoModule:
         Based on SnapLogic pipeline configuration
         """
         # Generate tracking ID for this request
-        import uuid
-        tracking_id = str(uuid.uuid4())
+        tracking_id = uuid.uuid4().hex
+
+        get = patient_data.get
+
+        # Emails and name parts (filter out empty/nan values like SnapLogic)
+        emails = [email for email in map(get, _EMAIL_FIELDS) if email and email not in _NOT_PROVIDED]
+        name_obj = {
+            dest: value for src, dest in _NAME_FIELDS
+            if (value := get(src)) and value not in _NOT_PROVIDED
+        }
+
+        dob = get('dob')
+        ssn = get('ssn')
+        gender = get('gender')
 
         # Build Verato request payload matching SnapLogic format
+        content = {
+            'sources': [{
+                'name': f"wellnecity.{get('data_version', 'v1')}",
+                'id': get('patient_id', '')
+            }],
+            'emails': emails,
+            'addresses': [{
+                'line1': get('address_1', ''),
+                'line2': get('address_2', ''),
+                'city': get('city', ''),
+                'state': get('state', ''),
+                'postalCode': get('zip', '')
+            }] if get('address_1') or get('city') else [],
+            # Phone numbers (complex formatting like SnapLogic)
+            'phoneNumbers': [
+                number for phone in map(get, _PHONE_FIELDS)
+                if phone and phone not in _PHONE_NOT_PROVIDED
+                and (number := _format_phone(_NON_DIGITS.sub('', str(phone))))
+            ],
+            'names': [name_obj] if name_obj else [],
+            # Date of birth formatted as yyyyMMdd
+            'datesOfBirth': [dob.replace('-', '').replace('/', '')] if dob and dob != 'nan' else [],
+            'ssns': [ssn.replace('-', '')] if ssn and ssn != 'nan' else [],
+            'genders': [gender] if gender and gender != 'nan' else []
+        }
+
         verato_payload = {
             'content': {
-                'identity': {
-                    'sources': [{
-                        'name': f"wellnecity.{patient_data.get('data_version', 'v1')}",
-                        'id': patient_data.get('patient_id', '')
-                    }],
-                    'emails': [],
-                    'addresses': [],
-                    'phoneNumbers': [],
-                    'names': [],
-                    'datesOfBirth': [],
-                    'ssns': [],
-                    'genders': []
-                },
+                'identity': content,
                 'responseIdentityFormatNames': ['DEFAULT'],
                 'trackingId': tracking_id
             }
         }
 
-        content = verato_payload['content']['identity']
-
-        # Add emails (filter out empty/nan values like SnapLogic)
-        emails = []
-        for email_field in ['work_email', 'home_email', 'other_email']:
-            email = patient_data.get(email_field)
-            if email and email not in ['nan', 'not-provided', '']:
-                emails.append(email)
-        if emails:
-            content['emails'] = emails
-
-        # Add address
-        if patient_data.get('address_1') or patient_data.get('city'):
-            content['addresses'] = [{
-                'line1': patient_data.get('address_1', ''),
-                'line2': patient_data.get('address_2', ''),
-                'city': patient_data.get('city', ''),
-                'state': patient_data.get('state', ''),
-                'postalCode': patient_data.get('zip', '')
-            }]
-
-        # Add name (filter out 'not-provided' and 'nan')
-        name_obj = {}
-        if patient_data.get('first_name') and patient_data['first_name'] not in ['nan', 'not-provided']:
-            name_obj['first'] = patient_data['first_name']
-        if patient_data.get('middle_name') and patient_data['middle_name'] not in ['nan', 'not-provided']:
-            name_obj['middle'] = patient_data['middle_name']
-        if patient_data.get('last_name') and patient_data['last_name'] not in ['nan', 'not-provided']:
-            name_obj['last'] = patient_data['last_name']
-        if patient_data.get('suffix') and patient_data['suffix'] not in ['nan', 'not-provided']:
-            name_obj['suffix'] = patient_data['suffix']
-
-        if name_obj:
-            content['names'] = [name_obj]
-
-        # Add date of birth (formatted as yyyyMMdd)
-        if patient_data.get('dob') and patient_data['dob'] not in ['nan', '']:
-            # Convert to yyyyMMdd format
-            dob = patient_data['dob'].replace('-', '').replace('/', '')
-            content['datesOfBirth'] = [dob]
-
-        # Add SSN (filter out nan)
-        if patient_data.get('ssn') and patient_data['ssn'] not in ['nan', '']:
-            content['ssns'] = [patient_data['ssn'].replace('-', '')]
-
-        # Add gender
-        if patient_data.get('gender') and patient_data['gender'] not in ['nan', '']:
-            content['genders'] = [patient_data['gender']]
-
-        # Add phone numbers (complex formatting like SnapLogic)
-        phone_numbers = []
-        for phone_field in ['home_phone', 'work_phone', 'other_phone']:
-            phone = patient_data.get(phone_field)
-            if phone and phone not in ['nan', 'not-provided', 'not-included', '']:
-                # Clean phone number
-                clean_phone = ''.join(filter(str.isdigit, str(phone)))
-                if len(clean_phone) == 10:
-                    phone_numbers.append({
-                        'countryCode': '1',
-                        'areaCode': clean_phone[:3],
-                        'number': clean_phone[3:],
-                        'extension': ''
-                    })
-                elif len(clean_phone) == 11 and clean_phone[0] == '1':
-                    phone_numbers.append({
-                        'countryCode': '1',
-                        'areaCode': clean_phone[1:4],
-                        'number': clean_phone[4:],
-                        'extension': ''
-                    })
-
-        if phone_numbers:
-            content['phoneNumbers'] = phone_numbers
-
-        # Make API call
-        headers = {
-            'Content-Type': 'application/json',
-            'Accept': '*/*',
-            'Connection': 'keep-alive'
-        }
+        # Fail fast while the circuit is open
+        if time.monotonic() < self._circuit_open_until:
+            return {
+                'verato_id': None,
+                'error': 'circuit open',
+                'tracking_id': tracking_id,
+                'source': 'circuit_open'
+            }
 
-        # Add authentication if using API key
-        if self.config.api_key:
-            headers['X-API-Key'] = self.config.api_key
+        # Make API call, retrying 5xx/429 responses with exponential backoff
+        session = await self._get_session()
+        for attempt in range(self.config.max_retries + 1):
+            result = await self._post_identity(session, self._endpoint, verato_payload, self._headers, tracking_id)
+            failed = result.get('status') in _RETRY_STATUSES or result['source'] in ('timeout', 'exception')
+            self._record_outcome(failed)
+
+            if (result.get('status') not in _RETRY_STATUSES or attempt == self.config.max_retries
+                    or time.monotonic() < self._circuit_open_until):
+                return result
+            await asyncio.sleep(0.1 * 2 ** attempt + random.uniform(0, 0.1))
+
+    def _record_outcome(self, failed: bool):
+        """Track an API attempt and open the circuit if too many recently failed"""
+        self._recent_failures.append(failed)
+        if (failed and len(self._recent_failures) >= _CIRCUIT_MIN_CALLS
+                and sum(self._recent_failures) / len(self._recent_failures) > self.config.circuit_failure_ratio):
+            logger.error(f"Verato circuit open for {self.config.circuit_cooldown}s")
+            self._circuit_open_until = time.monotonic() + self.config.circuit_cooldown
+            # Judge the upstream afresh once the cooldown ends
+            self._recent_failures.clear()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Shared session if one was given, else a module-owned pooled session"""
+        if self.session is not None:
+            return self.session
+
+        if self._own_session is None or self._own_session.closed:
+            async with self._session_lock:
+                if self._own_session is None or self._own_session.closed:
+                    # Keep-alive pool sized for batch_process's 40 concurrent calls
+                    connector = aiohttp.TCPConnector(limit=64, limit_per_host=64, ttl_dns_cache=300)
+                    self._own_session = aiohttp.ClientSession(
+                        connector=connector,
+                        timeout=aiohttp.ClientTimeout(total=self.config.timeout/1000)
+                    )
+
+        return self._own_session
+
+    async def close(self):
+        """Close the module-owned HTTP session (a shared session is left open)"""
+        if self._own_session is not None and not self._own_session.closed:
+            await self._own_session.close()
+        self._own_session = None
+
+    async def _post_identity(self, session: aiohttp.ClientSession, endpoint: str,
+                             verato_payload: Dict, headers: Dict, tracking_id: str) -> Dict:
+        """POST the identity payload to Verato and parse the linkId"""
+        try:
+            async with session.post(
+                endpoint,
+                data=orjson.dumps(verato_payload),
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=self.config.timeout/1000)
+            ) as response:
+
+                if response.status == 200:
+                    data = orjson.loads(await response.read())
+
+                    link_id = _extract_link_id(data)
+
+                    return {
+                        'verato_id': link_id,
+                        'confidence': data.get('confidence', 0.95),
+                        'tracking_id': tracking_id,
+                        'source': 'api'
+                    }
+                else:
+                    error_text = await response.text()
+                    logger.error(f"Verato API error: {response.status} - {error_text}")
+                    return {
+                        'verato_id': None,
+                        'error': f"API returned {response.status}",
+                        'status': response.status,
+                        'source': 'api_error'
+                    }
 
-        # Use the actual Verato endpoint from SnapLogic
-        endpoint = self.config.endpoint or 'https://cust0161-dev.verato-connect.com/link-ws/svc/postIdentity'
+        except asyncio.TimeoutError:
+            logger.error("Verato API timeout")
+            return {
+                'verato_id': None,
+                'error': 'timeout',
+                'source': 'timeout'
+            }
+        except Exception as e:
+            logger.error(f"Verato API exception: {e}")
+            return {
+                'verato_id': None,
+                'error': str(e),
+                'source': 'exception'
+            }
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(
-                    endpoint,
-                    json=verato_payload,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=self.config.timeout/1000)
-                ) as response:
-
-                    if response.status == 200:
-                        data = await response.json()
-
-                        # Extract Verato linkId from response
-                        # Based on SnapLogic: $response.entity.content.linkId
-                        link_id = None
-                        if 'entity' in data:
-                            link_id = data.get('entity', {}).get('content', {}).get('linkId')
-                        elif 'content' in data:
-                            link_id = data.get('content', {}).get('linkId')
-                        elif 'linkId' in data:
-                            link_id = data.get('linkId')
-
-                        return {
-                            'verato_id': link_id,
-                            'confidence': data.get('confidence', 0.95),
-                            'tracking_id': tracking_id,
-                            'source': 'api'
-                        }
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Verato API error: {response.status} - {error_text}")
-                        return {
-                            'verato_id': None,
-                            'error': f"API returned {response.status}",
-                            'source': 'api_error'
-                        }
+    def _result_document(self, patient_data: Dict, result: Dict, ssn_hash: Optional[str] = None) -> Dict:
+        """Build the MongoDB document stored for a Verato result"""
+        return {
+            'verato_id': result['verato_id'],
+            'confidence': result.get('confidence', 0),
+            'ssn_hash': ssn_hash or self._hash_ssn(patient_data.get('ssn', '')),
+            'created_at': datetime.utcnow(),
+            'source_data': {
+                # Store limited data for debugging
+                'has_ssn': bool(patient_data.get('ssn')),
+                'has_name': bool(patient_data.get('first_name') and patient_data.get('last_name')),
+                'has_dob': bool(patient_data.get('dob')),
+                'has_address': bool(patient_data.get('address'))
+            }
+        }
 
-            except asyncio.TimeoutError:
-                logger.error("Verato API timeout")
-                return {
-                    'verato_id': None,
-                    'error': 'timeout',
-                    'source': 'timeout'
-                }
-            except Exception as e:
-                logger.error(f"Verato API exception: {e}")
-                return {
-                    'verato_id': None,
-                    'error': str(e),
-                    'source': 'exception'
-                }
-
-    def _store_result(self, patient_data: Dict, result: Dict):
+    async def _store_result(self, patient_data: Dict, result: Dict, ssn_hash: Optional[str] = None):
         """Store Verato result in MongoDB"""
         try:
             if not result.get('verato_id'):
                 return
 
-            document = {
-                'verato_id': result['verato_id'],
-                'confidence': result.get('confidence', 0),
-                'ssn_hash': self._hash_ssn(patient_data.get('ssn', '')),
-                'created_at': datetime.utcnow(),
-                'source_data': {
-                    # Store limited data for debugging
-                    'has_ssn': bool(patient_data.get('ssn')),
-                    'has_name': bool(patient_data.get('first_name') and patient_data.get('last_name')),
-                    'has_dob': bool(patient_data.get('dob')),
-                    'has_address': bool(patient_data.get('address'))
-                }
-            }
+            document = self._result_document(patient_data, result, ssn_hash)
 
             # Upsert to handle duplicates
-            self.collection.update_one(
+            await self.collection.update_one(
                 {'verato_id': result['verato_id']},
                 {'$set': document},
                 upsert=True
@@ -367,41 +487,135 @@ class VeratoModule:
         except Exception as e:
             logger.error(f"Failed to store in MongoDB: {e}")
 
+    async def _store_results_bulk(self, items: List[Tuple[Dict, Dict, Optional[str]]]):
+        """Store (patient_data, result, ssn_hash) triples in one unordered bulk upsert"""
+        ops = [
+            UpdateOne(
+                {'verato_id': result['verato_id']},
+                {'$set': self._result_document(patient_data, result, ssn_hash)},
+                upsert=True
+            )
+            for patient_data, result, ssn_hash in items
+            if result.get('verato_id')
+        ]
+        if not ops:
+            return
+
+        try:
+            await self.collection.bulk_write(ops, ordered=False)
+            logger.info(f"Stored {len(ops)} Verato IDs in MongoDB")
+        except Exception as e:
+            logger.error(f"Failed to bulk store in MongoDB: {e}")
+
     async def batch_process(self, patient_records: list, max_concurrent: int = 40):
         """
         Process multiple patient records concurrently
         Matches SnapLogic's 40 concurrent calls capability
         """
-        semaphore = asyncio.Semaphore(max_concurrent)
-
-        async def process_with_limit(patient_data):
-            async with semaphore:
-                return await self.get_mpi_id(patient_data)
+        # Records with nothing to match on are answered without any I/O
+        results = [None if _has_matchable_fields(p) else dict(_INSUFFICIENT_DATA) for p in patient_records]
+        ssn_hashes = [self._hash_ssn(p.get('ssn', '')) for p in patient_records]
+        cache_keys = [self._build_cache_key(p, h) for p, h in zip(patient_records, ssn_hashes)]
+        cache_writes = {}
+
+        # 1. L1 memory cache, then one MGET for the rest instead of a GET per record
+        keyed = []
+        for i, key in enumerate(cache_keys):
+            if key and results[i] is None:
+                results[i] = self.memory_cache.get(key)
+                if results[i] is None:
+                    keyed.append(i)
+        if keyed:
+            try:
+                cached = await self.redis_client.mget([cache_keys[i] for i in keyed])
+                for i, value in zip(keyed, cached):
+                    if value:
+                        results[i] = orjson.loads(value)
+                        self.memory_cache[cache_keys[i]] = results[i]
+            except Exception as e:
+                logger.warning(f"Batch cache lookup failed: {e}")
 
-        tasks = [process_with_limit(patient) for patient in patient_records]
-        results = await asyncio.gather(*tasks)
+        # 2. One $in query for the SSN hashes the cache did not have
+        pending = [i for i, r in enumerate(results) if r is None and ssn_hashes[i]]
+        if pending:
+            try:
+                existing = {}
+                async for doc in self.collection.find(
+                    {'ssn_hash': {'$in': list({ssn_hashes[i] for i in pending})}},
+                    {'_id': 0, 'ssn_hash': 1, 'verato_id': 1, 'confidence': 1}
+                ):
+                    existing.setdefault(doc['ssn_hash'], doc)
+                for i in pending:
+                    doc = existing.get(ssn_hashes[i])
+                    if doc:
+                        results[i] = {
+                            'verato_id': doc['verato_id'],
+                            'confidence': doc.get('confidence', 0.95),
+                            'source': 'database'
+                        }
+                        if cache_keys[i]:
+                            cache_writes[cache_keys[i]] = results[i]
+            except Exception as e:
+                logger.warning(f"Batch database lookup failed: {e}")
+
+        # 3. Call the Verato API for the remaining misses with a fixed pool of
+        # max_concurrent workers pulling from a shared iterator
+        misses = [i for i, r in enumerate(results) if r is None]
+        pending = iter(misses)
+
+        async def worker():
+            for i in pending:
+                results[i] = await self._call_verato_api(patient_records[i])
+
+        await asyncio.gather(*(worker() for _ in range(min(max_concurrent, len(misses)))))
+        await self._store_results_bulk([(patient_records[i], results[i], ssn_hashes[i]) for i in misses])
+        for i in misses:
+            if cache_keys[i] and not results[i].get('error'):
+                cache_writes[cache_keys[i]] = results[i]
+
+        # 4. Write back every new cache entry in one pipelined round trip
+        self.memory_cache.update(cache_writes)
+        if cache_writes:
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for key, result in cache_writes.items():
+                    pipe.setex(key, self.config.cache_ttl, orjson.dumps(result))
+                await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Batch cache write failed: {e}")
 
         return results
 
     def get_stats(self) -> Dict:
-        """Get module statistics"""
-        try:
-            total_records = self.collection.count_documents({})
-            cache_keys = self.redis_client.dbsize()
-
-            # Get recent success rate
-            recent = list(self.collection.find(
-                {'created_at': {'$gte': datetime.utcnow() - timedelta(hours=1)}},
-                {'confidence': 1}
-            ).limit(1000))
+        """Get in-process module statistics (no I/O - see get_db_stats)"""
+        return {
+            'memory_cache_entries': len(self.memory_cache),
+            'circuit_open': time.monotonic() < self._circuit_open_until,
+            'recent_failure_ratio': sum(self._recent_failures) / max(len(self._recent_failures), 1)
+        }
 
-            avg_confidence = sum(r.get('confidence', 0) for r in recent) / len(recent) if recent else 0
+    async def get_db_stats(self) -> Dict:
+        """Get stored Verato ID statistics from MongoDB"""
+        try:
+            # Recent average confidence is computed server-side (one result document)
+            pipeline = [
+                {'$match': {'created_at': {'$gte': datetime.utcnow() - timedelta(hours=1)}}},
+                {'$group': {
+                    '_id': None,
+                    'avg_confidence': {'$avg': {'$ifNull': ['$confidence', 0]}},
+                    'count': {'$sum': 1}
+                }}
+            ]
+            total_records, recent = await asyncio.gather(
+                self.collection.count_documents({}),
+                self.collection.aggregate(pipeline).to_list(1)
+            )
+            recent = recent[0] if recent else {}
 
             return {
                 'total_verato_ids': total_records,
-                'cache_entries': cache_keys,
-                'recent_avg_confidence': avg_confidence,
-                'recent_count': len(recent)
+                'recent_avg_confidence': recent.get('avg_confidence', 0),
+                'recent_count': recent.get('count', 0)
             }
         except Exception as e:
             logger.error(f"Failed to get stats: {e}")
@@ -412,6 +626,7 @@ class VeratoModule:
 async def test_verato_module():
     """Test the Verato module with sample data"""
     module = VeratoModule()
+    await module.create_indexes()
 
     test_patient = {
         'ssn': '123-45-6789',
@@ -428,9 +643,11 @@ async def test_verato_module():
     result = await module.get_mpi_id(test_patient)
     print(f"Test result: {json.dumps(result, indent=2)}")
 
-    stats = module.get_stats()
+    stats = {**module.get_stats(), **await module.get_db_stats()}
     print(f"Module stats: {json.dumps(stats, indent=2)}")
 
+    await module.close()
+
 
 if __name__ == "__main__":
     # Run test
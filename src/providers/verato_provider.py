@@ -7,8 +7,10 @@ providing the new interface.
 """
 
 import os
+import time
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 
 from .base_provider import BaseMPIProvider, MPIResult, ProviderConfig
@@ -17,7 +19,7 @@ from .verato import VeratoModule, VeratoConfig
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class VeratoProviderConfig(ProviderConfig):
     """Configuration for Verato MPI Provider"""
 
@@ -40,6 +42,12 @@ class VeratoProviderConfig(ProviderConfig):
     redis_port: int = int(os.getenv('REDIS_PORT', '6379'))
     redis_db: int = int(os.getenv('REDIS_DB', '0'))
 
+    # Attach the module's raw result dict to MPIResult.metadata (debugging only)
+    include_raw_response: bool = os.getenv('VERATO_INCLUDE_RAW_RESPONSE', 'false').lower() == 'true'
+
+    # Seconds a health check result is reused (liveness probes hit it often)
+    health_cache_ttl_seconds: float = 5.0
+
     def to_verato_config(self) -> VeratoConfig:
         """Convert to legacy VeratoConfig format"""
         return VeratoConfig(
@@ -66,7 +74,8 @@ class VeratoProvider(BaseMPIProvider):
     Verato functionality.
     """
 
-    def __init__(self, config: VeratoProviderConfig = None, api_key: str = None, endpoint: str = None):
+    def __init__(self, config: VeratoProviderConfig = None, api_key: str = None, endpoint: str = None,
+                 session=None):
         super().__init__(config or VeratoProviderConfig())
         self.config: VeratoProviderConfig = self.config
 
@@ -76,6 +85,9 @@ class VeratoProvider(BaseMPIProvider):
         if endpoint:
             self.config.endpoint = endpoint
 
+        # Shared aiohttp session from the service context (not closed in cleanup)
+        self.session = session
+
         # Wrapped Verato module
         self.verato_module = None
 
@@ -86,6 +98,9 @@ class VeratoProvider(BaseMPIProvider):
         self.cache_hits = 0
         self.api_calls = 0
 
+        # (checked_at, status) of the last shallow health check
+        self._last_health: Optional[Tuple[float, Dict[str, Any]]] = None
+
     async def initialize(self) -> None:
         """Initialize the Verato module"""
         try:
@@ -93,7 +108,8 @@ class VeratoProvider(BaseMPIProvider):
             verato_config = self.config.to_verato_config()
 
             # Initialize the wrapped module
-            self.verato_module = VeratoModule(verato_config)
+            self.verato_module = VeratoModule(verato_config, session=self.session)
+            await self.verato_module.create_indexes()
 
             self._initialized = True
             logger.info("Verato Provider initialized successfully")
@@ -133,10 +149,7 @@ class VeratoProvider(BaseMPIProvider):
                     provider='verato',
                     source=verato_result.get('source', 'error'),
                     error=verato_result['error'],
-                    metadata={
-                        'tracking_id': verato_result.get('tracking_id'),
-                        'raw_response': verato_result
-                    }
+                    metadata=self._result_metadata(verato_result)
                 )
             else:
                 self.successful_calls += 1
@@ -152,10 +165,7 @@ class VeratoProvider(BaseMPIProvider):
                     confidence=verato_result.get('confidence', 0.95),
                     provider='verato',
                     source=verato_result.get('source', 'api'),
-                    metadata={
-                        'tracking_id': verato_result.get('tracking_id'),
-                        'raw_response': verato_result
-                    }
+                    metadata=self._result_metadata(verato_result)
                 )
 
         except Exception as e:
@@ -175,20 +185,24 @@ class VeratoProvider(BaseMPIProvider):
         Process multiple patient records using Verato's batch processing
         """
         try:
-            # Standardize all patient data
-            standardized_records = []
-            for patient in patient_records:
+            # One pass: standardize the valid records, pre-fill results for invalid ones
+            standardized_results: List[Optional[MPIResult]] = [None] * len(patient_records)
+            valid_records = []
+            valid_indices = []
+            for i, patient in enumerate(patient_records):
                 try:
                     self._validate_patient_data(patient)
-                    standardized = self._standardize_patient_data(patient)
-                    standardized_records.append(standardized)
+                    valid_records.append(self._standardize_patient_data(patient))
+                    valid_indices.append(i)
                 except Exception as e:
                     logger.warning(f"Skipping invalid patient record: {e}")
-                    standardized_records.append(None)
-
-            # Filter out None records for batch processing
-            valid_records = [r for r in standardized_records if r is not None]
-            valid_indices = [i for i, r in enumerate(standardized_records) if r is not None]
+                    standardized_results[i] = MPIResult(
+                        mpi_id=None,
+                        confidence=0.0,
+                        provider='verato',
+                        source='validation_error',
+                        error='Invalid patient data'
+                    )
 
             # Use Verato's batch processing
             if valid_records:
@@ -197,51 +211,34 @@ class VeratoProvider(BaseMPIProvider):
                 verato_results = []
 
             # Convert results to standardized format
-            standardized_results = []
-            valid_result_index = 0
-
-            for i, original_record in enumerate(standardized_records):
-                if original_record is None:
-                    # Invalid record
-                    standardized_results.append(MPIResult(
+            for i, verato_result in zip(valid_indices, verato_results):
+                if verato_result.get('error'):
+                    standardized_results[i] = MPIResult(
                         mpi_id=None,
                         confidence=0.0,
                         provider='verato',
-                        source='validation_error',
-                        error='Invalid patient data'
-                    ))
+                        source=verato_result.get('source', 'error'),
+                        error=verato_result['error'],
+                        metadata=self._result_metadata(verato_result)
+                    )
                 else:
-                    # Valid record - get corresponding result
-                    if valid_result_index < len(verato_results):
-                        verato_result = verato_results[valid_result_index]
-                        valid_result_index += 1
-
-                        if verato_result.get('error'):
-                            standardized_results.append(MPIResult(
-                                mpi_id=None,
-                                confidence=0.0,
-                                provider='verato',
-                                source=verato_result.get('source', 'error'),
-                                error=verato_result['error'],
-                                metadata={'raw_response': verato_result}
-                            ))
-                        else:
-                            standardized_results.append(MPIResult(
-                                mpi_id=verato_result.get('verato_id'),
-                                confidence=verato_result.get('confidence', 0.95),
-                                provider='verato',
-                                source=verato_result.get('source', 'api'),
-                                metadata={'raw_response': verato_result}
-                            ))
-                    else:
-                        # Missing result
-                        standardized_results.append(MPIResult(
-                            mpi_id=None,
-                            confidence=0.0,
-                            provider='verato',
-                            source='batch_error',
-                            error='Missing result from batch processing'
-                        ))
+                    standardized_results[i] = MPIResult(
+                        mpi_id=verato_result.get('verato_id'),
+                        confidence=verato_result.get('confidence', 0.95),
+                        provider='verato',
+                        source=verato_result.get('source', 'api'),
+                        metadata=self._result_metadata(verato_result)
+                    )
+
+            # Missing result
+            for i in valid_indices[len(verato_results):]:
+                standardized_results[i] = MPIResult(
+                    mpi_id=None,
+                    confidence=0.0,
+                    provider='verato',
+                    source='batch_error',
+                    error='Missing result from batch processing'
+                )
 
             return standardized_results
 
@@ -256,36 +253,60 @@ class VeratoProvider(BaseMPIProvider):
                 error=str(e)
             ) for _ in patient_records]
 
-    async def health_check(self) -> Dict[str, Any]:
-        """Check Verato provider health"""
+    async def health_check(self, deep: bool = False) -> Dict[str, Any]:
+        """
+        Check Verato provider health
+
+        Args:
+            deep: Run a full test match (may call the Verato API) instead of
+                pinging the module's MongoDB and Redis connections
+        """
+        now = time.monotonic()
+        if not deep and self._last_health and now - self._last_health[0] < self.config.health_cache_ttl_seconds:
+            return dict(self._last_health[1])
+
+        health = {
+            'status': 'healthy',
+            'provider': 'verato',
+            'test_successful': True,
+            'error': None,
+            'api_endpoint': self.config.endpoint,
+            'has_api_key': bool(self.config.api_key)
+        }
+
         try:
-            # Test with minimal data
-            test_patient = {
-                'first_name': 'TEST',
-                'last_name': 'PATIENT',
-                'dob': '2000-01-01'
-            }
-
-            result = await self.get_mpi_id(test_patient)
-
-            return {
-                'status': 'healthy' if not result.error else 'unhealthy',
-                'provider': 'verato',
-                'test_successful': result.error is None,
-                'error': result.error,
-                'api_endpoint': self.config.endpoint,
-                'has_api_key': bool(self.config.api_key)
-            }
+            if deep:
+                # Test with minimal data
+                test_patient = {
+                    'first_name': 'TEST',
+                    'last_name': 'PATIENT',
+                    'dob': '2000-01-01'
+                }
+
+                result = await self.get_mpi_id(test_patient)
+                health['status'] = 'healthy' if not result.error else 'unhealthy'
+                health['test_successful'] = result.error is None
+                health['error'] = result.error
+            elif self.verato_module:
+                # Ping the backing stores instead of running a full match
+                async with asyncio.timeout(0.2):
+                    await asyncio.gather(
+                        self.verato_module.mongo_client.admin.command('ping'),
+                        self.verato_module.redis_client.ping()
+                    )
+            else:
+                health['status'] = 'not_initialized'
+                health['test_successful'] = False
 
         except Exception as e:
-            return {
-                'status': 'unhealthy',
-                'provider': 'verato',
-                'test_successful': False,
-                'error': str(e),
-                'api_endpoint': self.config.endpoint,
-                'has_api_key': bool(self.config.api_key)
-            }
+            health['status'] = 'unhealthy'
+            health['test_successful'] = False
+            health['error'] = str(e) or type(e).__name__
+
+        if not deep:
+            # Callers get their own copy so annotating a result never alters the cache
+            self._last_health = (now, dict(health))
+        return health
 
     def get_stats(self) -> Dict[str, Any]:
         """Get Verato provider statistics"""
@@ -324,16 +345,25 @@ class VeratoProvider(BaseMPIProvider):
         if self.verato_module:
             try:
                 # Close connections in the wrapped module
+                await self.verato_module.close()
+
                 if hasattr(self.verato_module, 'mongo_client'):
                     self.verato_module.mongo_client.close()
 
                 if hasattr(self.verato_module, 'redis_client'):
-                    self.verato_module.redis_client.close()
+                    await self.verato_module.redis_client.aclose()
             except Exception as e:
                 logger.warning(f"Error cleaning up Verato module: {e}")
 
         await super().cleanup()
 
+    def _result_metadata(self, verato_result: Dict[str, Any]) -> Dict[str, Any]:
+        """MPIResult metadata for a module result (raw result only when configured)"""
+        metadata = {'tracking_id': verato_result.get('tracking_id')}
+        if self.config.include_raw_response:
+            metadata['raw_response'] = verato_result
+        return metadata
+
     def _convert_for_verato(self, patient_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Convert standardized patient data to format expected by Verato
@@ -4,34 +4,43 @@ Simple test script to verify provider modularization structure
 """
 
 import sys
+
+# Short-lived test entry point - skip writing .pyc files for every import
+sys.dont_write_bytecode = True
+
 import os
+import io
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+from providers import REQUIRED_METHODS
+
+# (module, label, names it must export) checked by test_imports
+_EXPECTED_EXPORTS = (
+    ('providers.base_provider', 'Base provider', frozenset({'BaseMPIProvider', 'MPIResult', 'ProviderConfig'})),
+    ('providers.verato_provider', 'Verato provider', frozenset({'VeratoProvider', 'VeratoProviderConfig'})),
+    ('providers.internal', 'Internal provider', frozenset({'InternalMPIProvider', 'InternalProviderConfig'})),
+    ('providers.hybrid', 'Hybrid provider', frozenset({'HybridMPIProvider', 'HybridProviderConfig', 'HybridStrategy'})),
+    ('providers', 'Provider package', frozenset({'PROVIDER_REGISTRY', 'get_provider_class', 'create_provider'})),
+)
+
 
 def test_imports():
     """Test that all provider modules can be imported"""
     print("Testing provider imports...")
 
     try:
-        # Test base provider
-        from providers.base_provider import BaseMPIProvider, MPIResult, ProviderConfig
-        print("✓ Base provider imports successful")
-
-        # Test individual providers
-        from providers.verato_provider import VeratoProvider, VeratoProviderConfig
-        print("✓ Verato provider imports successful")
-
-        from providers.internal import InternalMPIProvider, InternalProviderConfig
-        print("✓ Internal provider imports successful")
-
-        from providers.hybrid import HybridMPIProvider, HybridProviderConfig, HybridStrategy
-        print("✓ Hybrid provider imports successful")
-
-        # Test package imports
-        from providers import PROVIDER_REGISTRY, get_provider_class, create_provider
-        print("✓ Provider package imports successful")
+        # Import the package once, then resolve each module and check its exports
+        importlib.import_module('providers')
+        for module_name, label, names in _EXPECTED_EXPORTS:
+            module = importlib.import_module(module_name)
+            missing = names.difference(dir(module))
+            assert not missing, f"{module_name} is missing {sorted(missing)}"
+            print(f"✓ {label} imports successful")
 
         return True
 
@@ -47,23 +56,24 @@ def test_provider_registry():
     try:
         from providers import PROVIDER_REGISTRY, get_provider_class, create_provider
 
-        # Test registry contents
+        # One pass per provider: registry contents, get_provider_class and
+        # create_provider (without config) - each provider is built once
         expected_providers = ['verato', 'internal', 'hybrid']
         for provider_name in expected_providers:
             assert provider_name in PROVIDER_REGISTRY, f"Missing provider: {provider_name}"
-            print(f"✓ {provider_name} registered")
 
-        # Test get_provider_class
-        for provider_name in expected_providers:
             provider_class = get_provider_class(provider_name)
             assert provider_class is not None, f"Failed to get class for {provider_name}"
-            print(f"✓ get_provider_class('{provider_name}') works")
 
-        # Test create_provider (without config)
-        for provider_name in expected_providers:
             provider = create_provider(provider_name)
             assert provider is not None, f"Failed to create {provider_name}"
-            print(f"✓ create_provider('{provider_name}') works")
+
+            # One write per provider once all three checks have passed
+            sys.stdout.write(
+                f"✓ {provider_name} registered\n"
+                f"✓ get_provider_class('{provider_name}') works\n"
+                f"✓ create_provider('{provider_name}') works\n"
+            )
 
         return True
 
@@ -86,18 +96,13 @@ def test_interface_compliance():
             ('HybridMPIProvider', HybridMPIProvider)
         ]
 
-        required_methods = [
-            'initialize', 'get_mpi_id', 'batch_process',
-            'health_check', 'get_stats', 'cleanup'
-        ]
-
         for provider_name, provider_class in providers:
             # Check inheritance
             assert issubclass(provider_class, BaseMPIProvider), f"{provider_name} doesn't inherit from BaseMPIProvider"
 
             # Check methods
-            for method in required_methods:
-                assert hasattr(provider_class, method), f"{provider_name} missing method: {method}"
+            missing = REQUIRED_METHODS.difference(dir(provider_class))
+            assert not missing, f"{provider_name} missing methods: {missing}"
 
             print(f"✓ {provider_name} implements required interface")
 
@@ -172,9 +177,18 @@ def test_file_structure():
         'src/main.py'
     ]
 
+    # One directory listing per parent instead of a stat per file
+    present = set()
+    for directory in {os.path.dirname(file_path) for file_path in expected_files}:
+        try:
+            with os.scandir(directory) as entries:
+                present.update(f"{directory}/{entry.name}" for entry in entries)
+        except FileNotFoundError:
+            pass
+
     all_exist = True
     for file_path in expected_files:
-        if os.path.exists(file_path):
+        if file_path in present:
             print(f"✓ {file_path} exists")
         else:
             print(f"✗ {file_path} missing")
@@ -183,6 +197,44 @@ def test_file_structure():
     return all_exist
 
 
+_SUCCESS_SUMMARY = (
+    "🎉 All provider modularization tests PASSED!\n"
+    "\n✅ Provider modularization verification successful!\n"
+    "\nSummary:\n"
+    "- ✅ Base provider interface created\n"
+    "- ✅ Verato provider follows standard interface\n"
+    "- ✅ Internal provider created with probabilistic matching\n"
+    "- ✅ Hybrid provider created with multiple strategies\n"
+    "- ✅ Provider registry and dynamic loading works\n"
+    "- ✅ All providers implement required interface\n"
+)
+
+
+class _ThreadStdout:
+    """stdout that writes to a per-thread buffer when one is set"""
+
+    def __init__(self, default):
+        self.default = default
+        self.local = threading.local()
+
+    def write(self, text):
+        return getattr(self.local, 'buffer', self.default).write(text)
+
+    def flush(self):
+        self.default.flush()
+
+
+def _run_captured(test_func):
+    """Run a test on a worker thread, returning (result or exception, its output)"""
+    buffer = sys.stdout.local.buffer = io.StringIO()
+    try:
+        return test_func(), buffer.getvalue()
+    except Exception as e:
+        return e, buffer.getvalue()
+    finally:
+        del sys.stdout.local.buffer
+
+
 def main():
     """Run all tests"""
     print("🧪 Starting Provider Modularization Verification\n")
@@ -198,30 +250,47 @@ def main():
     passed = 0
     total = len(tests)
 
-    for test_name, test_func in tests:
-        print(f"\n{'='*20} {test_name} {'='*20}")
-        try:
-            if test_func():
-                print(f"✅ {test_name} PASSED")
-                passed += 1
-            else:
-                print(f"❌ {test_name} FAILED")
-        except Exception as e:
-            print(f"❌ {test_name} FAILED with exception: {e}")
+    # Run test_imports first on its own: it warms the import cache so the
+    # workers don't serialize on the import lock, and if it fails the tests
+    # that import provider modules cannot pass, so only the file check runs.
+    # The rest run concurrently and are reported in order.
+    stdout = sys.stdout
+    sys.stdout = _ThreadStdout(stdout)
+    try:
+        imports_outcome = _run_captured(test_imports)
+        if imports_outcome[0] is True:
+            pending = [test_func for _, test_func in tests if test_func is not test_imports]
+        else:
+            pending = [test_file_structure]
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            futures = {test_func: executor.submit(_run_captured, test_func) for test_func in pending}
+            results = {test_func: future.result() for test_func, future in futures.items()}
+        results[test_imports] = imports_outcome
+        outcomes = [results.get(test_func, (None, '')) for _, test_func in tests]
+    finally:
+        sys.stdout = stdout
+
+    # Assemble the whole per-test report and write it in one call
+    report = []
+    for (test_name, _), (result, output) in zip(tests, outcomes):
+        report.append(f"\n{'='*20} {test_name} {'='*20}\n")
+        report.append(output)
+        if result is None:
+            report.append(f"⏭️  {test_name} SKIPPED (imports failed)\n")
+        elif isinstance(result, Exception):
+            report.append(f"❌ {test_name} FAILED with exception: {result}\n")
+        elif result:
+            report.append(f"✅ {test_name} PASSED\n")
+            passed += 1
+        else:
+            report.append(f"❌ {test_name} FAILED\n")
+    sys.stdout.write(''.join(report))
 
     print(f"\n{'='*60}")
     print(f"🏁 Tests completed: {passed}/{total} passed")
 
     if passed == total:
-        print("🎉 All provider modularization tests PASSED!")
-        print("\n✅ Provider modularization verification successful!")
-        print("\nSummary:")
-        print("- ✅ Base provider interface created")
-        print("- ✅ Verato provider follows standard interface")
-        print("- ✅ Internal provider created with probabilistic matching")
-        print("- ✅ Hybrid provider created with multiple strategies")
-        print("- ✅ Provider registry and dynamic loading works")
-        print("- ✅ All providers implement required interface")
+        sys.stdout.write(_SUCCESS_SUMMARY)
         return True
     else:
         print("❌ Some tests failed. Please check the output above.")